@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+LOCAL_CACHE_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+
+SHARED_CACHE_SETTINGS = ('RESPONSE_CACHE_ALIAS', 'REPLICA_PIN_CACHE_ALIAS')
+
+
+@register(Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    """
+    Предупреждает, если кеш ответов или закреплений за основной базой
+    хранится в памяти процесса. Версии ресурсов и закрепления,
+    записанные одним воркером, тогда не видны другим.
+    """
+    if settings.DEBUG:
+        return []
+    warnings = []
+    for setting in SHARED_CACHE_SETTINGS:
+        alias = getattr(settings, setting)
+        if settings.CACHES[alias]['BACKEND'] != LOCAL_CACHE_BACKEND:
+            continue
+        warnings.append(Warning(
+            f'Кеш {setting} = {alias!r} хранится в памяти процесса.',
+            hint=(
+                'Задайте для него общий для всех процессов кеш, например '
+                'memcached: сброс кеша ответов и закрепление за основной '
+                'базой иначе не действуют между воркерами.'
+            ),
+            id='api.W001',
+        ))
+    return warnings
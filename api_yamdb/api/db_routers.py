@@ -0,0 +1,34 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY = 'default'
+
+use_replica = ContextVar('use_replica', default=False)
+
+has_written = ContextVar('has_written', default=False)
+
+
+class ReplicaRouter:
+    """
+    Роутер чтения из реплик.
+    Чтение уходит в случайную реплику из DATABASE_REPLICAS, только
+    если ReplicaPinningMiddleware разрешила это для текущего запроса.
+    Запись всегда идет в основную базу, после нее до конца запроса
+    читается тоже основная база.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if replicas and use_replica.get():
+            return random.choice(replicas)
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        use_replica.set(False)
+        has_written.set(True)
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
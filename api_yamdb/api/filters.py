@@ -1,4 +1,6 @@
 import django_filters
+from django.db.models.functions import Lower
+from rest_framework.filters import SearchFilter
 
 from reviews.models import Title
 
@@ -22,3 +24,39 @@ class TitleFilter(django_filters.FilterSet):
     class Meta:
         model = Title
         fields = ('name', 'year', 'genre', 'category')
+
+
+class UserSearchFilter(SearchFilter):
+    """
+    Поиск пользователей.
+    По умолчанию ?search= ищет по префиксу username без учета регистра
+    диапазонным запросом по индексу LOWER(username), а префикс
+    с буквами не из ASCII — через istartswith. Поиск по подстроке
+    включается параметром ?search_mode=contains. Параметр ?email= ищет
+    по email без учета регистра через индекс по LOWER(email).
+    """
+
+    mode_param = 'search_mode'
+    contains_mode = 'contains'
+    email_param = 'email'
+
+    def filter_queryset(self, request, queryset, view):
+        email = request.query_params.get(self.email_param, '').strip()
+        if email:
+            queryset = queryset.alias(email_lower=Lower('email')).filter(
+                email_lower=email.lower()
+            )
+        if request.query_params.get(self.mode_param) == self.contains_mode:
+            return super().filter_queryset(request, queryset, view)
+        prefix = request.query_params.get(self.search_param, '').strip()
+        if not prefix:
+            return queryset
+        if not prefix.isascii():
+            # LOWER() в SQLite приводит к нижнему регистру только ASCII,
+            # и диапазон по индексу не нашел бы остальные буквы.
+            return queryset.filter(username__istartswith=prefix)
+        prefix = prefix.lower()
+        return queryset.alias(username_lower=Lower('username')).filter(
+            username_lower__gte=prefix,
+            username_lower__lt=prefix[:-1] + chr(ord(prefix[-1]) + 1),
+        )
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+
+from api_yamdb.asgi import APIASGIHandler
+
+
+def get_query_string(number):
+    """
+    Возвращает уникальную строку запроса: кеш ответов различает
+    запросы по ней, и представление выполняется каждый раз.
+    """
+    return f'benchmark={time.monotonic_ns()}-{number}'
+
+
+class Command(BaseCommand):
+    """
+    Сравнение пропускной способности WSGI и ASGI на запросах чтения.
+
+    Запросы передаются обработчикам Django внутри процесса, без
+    сервера. Медленный клиент имитируется задержкой --client-delay
+    перед получением запроса: под WSGI ее пережидает рабочий поток,
+    как синхронный воркер gunicorn, а под ASGI — цикл событий.
+    Под WSGI одновременно обрабатывается не больше --threads
+    запросов, под ASGI — не больше --clients. Каждый запрос получает
+    уникальную строку запроса, чтобы его не обслужил кеш ответов.
+
+    Использование:
+    python manage.py benchmark_asgi [--path /api/v1/titles/]
+    [--requests 1000] [--clients 100] [--threads 8]
+    [--client-delay 0.05]
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default='/api/v1/titles/',
+            help='Путь запроса (по умолчанию /api/v1/titles/).')
+        parser.add_argument(
+            '--requests', type=int, default=1000,
+            help='Число запросов (по умолчанию 1000).')
+        parser.add_argument(
+            '--clients', type=int, default=100,
+            help='Одновременных клиентов под ASGI (по умолчанию 100).')
+        parser.add_argument(
+            '--threads', type=int, default=8,
+            help='Рабочих потоков под WSGI (по умолчанию 8).')
+        parser.add_argument(
+            '--client-delay', type=float, default=0.05,
+            help='Задержка медленного клиента в секундах '
+                 '(по умолчанию 0.05).')
+
+    def handle(self, *args, **kwargs):
+        """Метод обработки для команды управления."""
+        for name, run in (('WSGI', self.run_wsgi), ('ASGI', self.run_asgi)):
+            statuses = run(kwargs, requests=1)
+            start = time.perf_counter()
+            statuses = run(kwargs, requests=kwargs['requests'])
+            seconds = time.perf_counter() - start
+            errors = sum(status >= 400 for status in statuses)
+            self.stdout.write(self.style.SUCCESS(
+                f'{name}: {len(statuses) / seconds:.0f} запросов/с, '
+                f'ошибок {errors}'))
+
+    def run_wsgi(self, options, requests):
+        """Выполняет запросы через WSGIHandler в пуле потоков."""
+        application = WSGIHandler()
+
+        def get(number):
+            time.sleep(options['client_delay'])
+            environ = {
+                'PATH_INFO': options['path'],
+                'QUERY_STRING': get_query_string(number),
+                'HTTP_HOST': 'localhost',
+            }
+            setup_testing_defaults(environ)
+            statuses = []
+            response = application(
+                environ,
+                lambda status, headers: statuses.append(int(status[:3])),
+            )
+            b''.join(response)
+            response.close()
+            return statuses[0]
+
+        with ThreadPoolExecutor(options['threads']) as pool:
+            return list(pool.map(get, range(requests)))
+
+    def run_asgi(self, options, requests):
+        """Выполняет запросы через обработчик ASGI в цикле событий."""
+        application = APIASGIHandler()
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': options['path'],
+            'root_path': '',
+            'headers': [(b'host', b'localhost')],
+            'client': ('127.0.0.1', 0),
+            'server': ('localhost', 80),
+        }
+
+        async def get(semaphore, number):
+            messages = []
+
+            async def receive():
+                await asyncio.sleep(options['client_delay'])
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                messages.append(message)
+
+            async with semaphore:
+                await application(
+                    {
+                        **scope,
+                        'query_string': get_query_string(number).encode(),
+                    },
+                    receive,
+                    send,
+                )
+            return messages[0]['status']
+
+        async def run():
+            semaphore = asyncio.Semaphore(options['clients'])
+            return await asyncio.gather(
+                *(get(semaphore, number) for number in range(requests))
+            )
+
+        return asyncio.run(run())
@@ -0,0 +1,371 @@
+import fcntl
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+FILE_NAME = 'metrics-{}.json'
+
+# Файл процесса: metrics-<pid>-<метка>.json.
+PROCESS_FILE_RE = re.compile(r'^metrics-(\d+)-[0-9a-f]+\.json$')
+
+# Наблюдения завершившихся процессов, сложенные в один файл.
+ARCHIVE_NAME = 'metrics.json'
+
+LOCK_NAME = 'metrics.lock'
+
+METHODS = ('GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+# Счетчики текущего запроса. Задаются RequestMetricsMiddleware
+# и попадают в потоки sync_to_async вместе с контекстом.
+current_stats = ContextVar('current_stats', default=None)
+
+serializer_depth = ContextVar('serializer_depth', default=0)
+
+lock = threading.Lock()
+
+last_flush = 0
+
+# Имя файла метрик процесса и pid, для которого оно создано.
+file_name = None
+
+file_pid = None
+
+
+class RequestStats:
+    """Счетчики одного запроса."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+
+
+class Histogram:
+    """
+    Гистограмма Prometheus с метками view и method.
+    Для каждой пары меток хранятся число наблюдений в каждой
+    корзине (последняя — +Inf) и их сумма.
+    """
+
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.samples = {}
+
+    def observe(self, labels, value):
+        """Добавляет наблюдение. Вызывается под lock."""
+        sample = self.samples.setdefault(
+            labels, {'buckets': [0] * (len(self.buckets) + 1), 'sum': 0}
+        )
+        sample['buckets'][bisect_left(self.buckets, value)] += 1
+        sample['sum'] += value
+
+
+HISTOGRAMS = (
+    Histogram(
+        'api_request_duration_seconds',
+        'Длительность обработки запроса.',
+        DURATION_BUCKETS,
+    ),
+    Histogram(
+        'api_request_db_queries',
+        'Число запросов к базе за запрос.',
+        QUERY_BUCKETS,
+    ),
+    Histogram(
+        'api_request_db_seconds',
+        'Время запросов к базе за запрос.',
+        DURATION_BUCKETS,
+    ),
+    Histogram(
+        'api_request_serializer_seconds',
+        'Время сериализации и валидации за запрос.',
+        DURATION_BUCKETS,
+    ),
+    Histogram(
+        'api_response_size_bytes',
+        'Размер тела ответа.',
+        SIZE_BUCKETS,
+    ),
+)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Обертка выполнения SQL: учитывает запрос и его время
+    в счетчиках текущего запроса.
+    """
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - start
+
+
+@contextmanager
+def serializer_timer():
+    """
+    Учитывает время сериализации в счетчиках текущего запроса.
+    Вложенные сериализаторы не учитываются повторно.
+    """
+    stats = current_stats.get()
+    if stats is None or serializer_depth.get():
+        yield
+        return
+    token = serializer_depth.set(1)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serializer_seconds += time.perf_counter() - start
+        serializer_depth.reset(token)
+
+
+def get_labels(request):
+    """Возвращает метки запроса: имя представления и метод."""
+    match = request.resolver_match
+    view = match.view_name if match else 'unresolved'
+    method = request.method if request.method in METHODS else 'other'
+    return view, method
+
+
+def observe_request(labels, stats, seconds, size):
+    """Добавляет наблюдения запроса во все гистограммы."""
+    with lock:
+        for histogram, value in zip(HISTOGRAMS, (
+            seconds,
+            stats.queries,
+            stats.db_seconds,
+            stats.serializer_seconds,
+            size,
+        )):
+            histogram.observe(labels, value)
+    flush()
+
+
+def dump_samples():
+    """Возвращает наблюдения процесса в виде, пригодном для JSON."""
+    with lock:
+        return {
+            histogram.name: [
+                [list(labels), sample['buckets'], sample['sum']]
+                for labels, sample in histogram.samples.items()
+            ]
+            for histogram in HISTOGRAMS
+        }
+
+
+def get_file_name():
+    """
+    Возвращает имя файла метрик процесса. Кроме pid в него входит
+    случайная метка, которая создается заново в каждом процессе:
+    воркер, получивший pid завершившегося, не перезапишет его файл,
+    и суммы по всем файлам не уменьшатся.
+    """
+    global file_name, file_pid
+    pid = os.getpid()
+    if file_pid != pid:
+        file_pid = pid
+        file_name = FILE_NAME.format(f'{pid}-{uuid.uuid4().hex}')
+    return file_name
+
+
+def write_json(path, data):
+    """
+    Записывает JSON в файл атомарно: читатели не видят его
+    частично записанным.
+    """
+    tmp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+    tmp_path.write_text(json.dumps(data))
+    os.replace(tmp_path, path)
+
+
+def flush(force=False):
+    """
+    Сохраняет наблюдения процесса в METRICS_MULTIPROCESS_DIR
+    не чаще раза в METRICS_FLUSH_SECONDS секунд.
+    """
+    global last_flush
+    directory = settings.METRICS_MULTIPROCESS_DIR
+    now = time.monotonic()
+    if not directory or (
+        not force and now - last_flush < settings.METRICS_FLUSH_SECONDS
+    ):
+        return
+    last_flush = now
+    write_json(Path(directory) / get_file_name(), dump_samples())
+
+
+@contextmanager
+def directory_lock(directory, operation):
+    """Блокирует каталог метрик между процессами через flock."""
+    with open(Path(directory) / LOCK_NAME, 'a') as lock_file:
+        fcntl.flock(lock_file, operation)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def is_alive(pid):
+    """Проверяет, что процесс pid еще работает."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def read_archive(directory):
+    """
+    Возвращает наблюдения завершившихся процессов и имена уже
+    сложенных в них файлов, которые еще не удалены.
+    """
+    path = Path(directory) / ARCHIVE_NAME
+    if not path.exists():
+        return {'samples': {}, 'folded': []}
+    return json.loads(path.read_text())
+
+
+def merge_samples(merged, samples):
+    """Добавляет наблюдения samples к сумме merged."""
+    for name, rows in samples.items():
+        for labels, buckets, total in rows:
+            sample = merged.setdefault(name, {}).setdefault(
+                tuple(labels), [[0] * len(buckets), 0]
+            )
+            sample[0] = [a + b for a, b in zip(sample[0], buckets)]
+            sample[1] += total
+
+
+def dump_merged(merged):
+    """Возвращает сумму наблюдений в виде, пригодном для JSON."""
+    return {
+        name: [[list(labels), *sample] for labels, sample in samples.items()]
+        for name, samples in merged.items()
+    }
+
+
+def fold_dead_files(directory):
+    """
+    Складывает наблюдения завершившихся процессов в ARCHIVE_NAME
+    и удаляет их файлы: при перезапусках воркеров число файлов
+    и время сбора метрик не растут. Имена сложенных файлов хранятся
+    в архиве, пока файлы не удалены, и после сбоя между записью
+    архива и удалением файла они не учитываются дважды.
+    """
+    directory = Path(directory)
+    dead = [
+        path for path in directory.glob(FILE_NAME.format('*'))
+        if (match := PROCESS_FILE_RE.match(path.name))
+        and not is_alive(int(match[1]))
+    ]
+    if not dead:
+        return
+    with directory_lock(directory, fcntl.LOCK_EX):
+        archive = read_archive(directory)
+        folded = {
+            name for name in archive['folded']
+            if (directory / name).exists()
+        }
+        merged = {}
+        merge_samples(merged, archive['samples'])
+        for path in dead:
+            if path.name in folded or not path.exists():
+                continue
+            merge_samples(merged, json.loads(path.read_text()))
+            folded.add(path.name)
+        write_json(directory / ARCHIVE_NAME, {
+            'samples': dump_merged(merged),
+            'folded': sorted(folded),
+        })
+        for name in folded:
+            (directory / name).unlink(missing_ok=True)
+
+
+def collect():
+    """
+    Возвращает наблюдения для выдачи: процесса, а при заданной
+    METRICS_MULTIPROCESS_DIR — сумму по файлам всех процессов.
+    Наблюдения завершившихся процессов тоже учитываются: счетчики
+    Prometheus не должны уменьшаться.
+    """
+    directory = settings.METRICS_MULTIPROCESS_DIR
+    if not directory:
+        return dump_samples()
+    flush(force=True)
+    fold_dead_files(directory)
+    merged = {histogram.name: {} for histogram in HISTOGRAMS}
+    with directory_lock(directory, fcntl.LOCK_SH):
+        archive = read_archive(directory)
+        merge_samples(merged, archive['samples'])
+        for path in Path(directory).glob(FILE_NAME.format('*')):
+            if path.name not in archive['folded']:
+                merge_samples(merged, json.loads(path.read_text()))
+    return dump_merged(merged)
+
+
+def format_labels(labels, le=None):
+    """Форматирует метки в синтаксисе Prometheus."""
+    view, method = labels
+    pairs = [('view', view), ('method', method)]
+    if le is not None:
+        pairs.append(('le', le))
+    return ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', '\\\\').replace('"', '\\"')
+        )
+        for name, value in pairs
+    )
+
+
+def render():
+    """Возвращает метрики в текстовом формате Prometheus."""
+    samples = collect()
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.append(f'# HELP {histogram.name} {histogram.documentation}')
+        lines.append(f'# TYPE {histogram.name} histogram')
+        for labels, buckets, total in sorted(samples[histogram.name]):
+            count = 0
+            for bound, bucket in zip(
+                (*histogram.buckets, '+Inf'), buckets
+            ):
+                count += bucket
+                lines.append('{}_bucket{{{}}} {}'.format(
+                    histogram.name, format_labels(labels, bound), count
+                ))
+            lines.append('{}_sum{{{}}} {}'.format(
+                histogram.name, format_labels(labels), total
+            ))
+            lines.append('{}_count{{{}}} {}'.format(
+                histogram.name, format_labels(labels), count
+            ))
+    return '\n'.join(lines) + '\n'
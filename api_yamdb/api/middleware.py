@@ -0,0 +1,401 @@
+import hashlib
+import time
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async
+)
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from rest_framework.permissions import SAFE_METHODS
+
+from api import metrics, query_log, response_cache
+from api.db_routers import has_written, use_replica
+from api.pagination import is_streamed_page
+
+
+def get_pin_key(request):
+    """
+    Возвращает ключ клиента для закрепления за основной базой:
+    по заголовку Authorization, а для анонимных клиентов по IP.
+    """
+    client = request.META.get(
+        'HTTP_AUTHORIZATION', request.META.get('REMOTE_ADDR', '')
+    )
+    return 'replica-pin:' + hashlib.sha256(client.encode()).hexdigest()
+
+
+def iter_with(content, var, value):
+    """
+    Перебирает потоковый ответ, задавая переменной контекста var
+    значение value на время получения каждой части: тело такого
+    ответа строится уже после выхода из промежуточного слоя.
+    """
+    iterator = iter(content)
+    while True:
+        token = var.set(value)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            var.reset(token)
+        yield chunk
+
+
+class SyncAndAsyncMiddleware:
+    """
+    Основа промежуточного слоя, который работает и под WSGI,
+    и под ASGI без переключения в поток на каждый запрос.
+    Если следующий слой асинхронный, запрос обрабатывает acall,
+    иначе call.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            # Помеченный экземпляр Django, как и MiddlewareMixin,
+            # считает асинхронным.
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self.get_response):
+            return self.acall(request)
+        return self.call(request)
+
+
+class ReplicaPinningMiddleware(SyncAndAsyncMiddleware):
+    """
+    Разрешает чтение из реплик для безопасных запросов.
+    Клиент, который записал данные, на REPLICA_PIN_SECONDS секунд
+    закрепляется за основной базой и видит свои изменения, даже если
+    реплика еще не догнала основную базу.
+    """
+
+    def call(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        tokens = self.start(request, self.is_pinned(request))
+        try:
+            response = self.get_response(request)
+            if has_written.get():
+                self.pin(request)
+        finally:
+            self.finish(tokens)
+        return response
+
+    async def acall(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+        tokens = self.start(
+            request, await sync_to_async(self.is_pinned)(request)
+        )
+        try:
+            response = await self.get_response(request)
+            if has_written.get():
+                await sync_to_async(self.pin)(request)
+        finally:
+            self.finish(tokens)
+        return response
+
+    def is_pinned(self, request):
+        """Проверяет, закреплен ли клиент за основной базой."""
+        return caches[settings.REPLICA_PIN_CACHE_ALIAS].get(
+            get_pin_key(request)
+        )
+
+    def pin(self, request):
+        """Закрепляет клиента за основной базой."""
+        caches[settings.REPLICA_PIN_CACHE_ALIAS].set(
+            get_pin_key(request), True, settings.REPLICA_PIN_SECONDS
+        )
+
+    def start(self, request, pinned):
+        """Задает роутеру режим чтения на время запроса."""
+        return (
+            use_replica.set(request.method in SAFE_METHODS and not pinned),
+            has_written.set(False),
+        )
+
+    def finish(self, tokens):
+        """Возвращает режим чтения роутера к исходному."""
+        replica_token, written_token = tokens
+        use_replica.reset(replica_token)
+        has_written.reset(written_token)
+
+
+class AnonymousResponseCacheMiddleware(SyncAndAsyncMiddleware):
+    """
+    Кеш ответов на GET-запросы анонимных клиентов.
+
+    Кешируются пути из RESPONSE_CACHE_PATHS, ключ строится по пути,
+    отсортированным параметрам запроса и заголовкам из Vary ответа.
+    Запросы с заголовком Authorization, запросы к /users/ и страницы,
+    которые отдаются потоком, идут мимо кеша. Вместе с ответом
+    хранятся версии ресурсов, от которых он зависит; запись в ресурс
+    увеличивает его версию. Устаревший ответ еще
+    RESPONSE_CACHE_STALE_SECONDS секунд отдается клиентам, пока
+    один запрос, захвативший аренду, строит новый.
+
+    Если ответа в кеше нет, его тоже строит один запрос: потоки
+    процесса ждут на блокировке, а другие процессы ждут, пока
+    держатель аренды сохранит ответ. Если построенный ответ
+    не сохраняется, например ошибка, ждущие строят его сами
+    параллельно.
+    """
+
+    def call(self, request):
+        resources = self.get_resources(request)
+        if resources is None:
+            return self.get_response(request)
+        versions = response_cache.get_versions(resources)
+        response, lease_key = self.check_cache(request, versions)
+        if response is not None:
+            return response
+        if lease_key is not None:
+            return self.rebuild(request, versions, lease_key)
+        key = response_cache.get_flight_key(request)
+        with response_cache.local_flight(key) as flight:
+            if not flight.passthrough:
+                response, lease_key = self.check_cache(request, versions)
+                if response is None and lease_key is None:
+                    if response_cache.acquire_lease(key):
+                        lease_key = key
+                    else:
+                        response = self.build_response(
+                            response_cache.wait_for_entry(
+                                request, key, versions
+                            ),
+                            'HIT',
+                        )
+                if response is not None:
+                    return response
+                flight.passthrough = True
+                response = self.rebuild(request, versions, lease_key)
+                flight.passthrough = not self.is_cacheable(response)
+                return response
+        return self.rebuild(request, versions)
+
+    async def acall(self, request):
+        resources = self.get_resources(request)
+        if resources is None:
+            return await self.get_response(request)
+        versions = await sync_to_async(response_cache.get_versions)(
+            resources
+        )
+        check_cache = sync_to_async(self.check_cache)
+        response, lease_key = await check_cache(request, versions)
+        if response is not None:
+            return response
+        if lease_key is not None:
+            return await self.arebuild(request, versions, lease_key)
+        key = await sync_to_async(response_cache.get_flight_key)(request)
+        async with response_cache.async_flight(key) as flight:
+            if not flight.passthrough:
+                response, lease_key = await check_cache(request, versions)
+                if response is None and lease_key is None:
+                    if await sync_to_async(response_cache.acquire_lease)(
+                        key
+                    ):
+                        lease_key = key
+                    else:
+                        response = self.build_response(
+                            await response_cache.await_entry(
+                                request, key, versions
+                            ),
+                            'HIT',
+                        )
+                if response is not None:
+                    return response
+                flight.passthrough = True
+                response = await self.arebuild(request, versions, lease_key)
+                flight.passthrough = not self.is_cacheable(response)
+                return response
+        return await self.arebuild(request, versions)
+
+    def get_resources(self, request):
+        """
+        Возвращает ресурсы, от которых зависит ответ,
+        или None, если запрос идет мимо кеша.
+        """
+        if (
+            request.method != 'GET'
+            or 'HTTP_AUTHORIZATION' in request.META
+            or '/users/' in request.path
+            or is_streamed_page(request)
+        ):
+            return None
+        return response_cache.get_resources(request.path)
+
+    def check_cache(self, request, versions):
+        """
+        Ищет ответ в кеше. Возвращает пару (ответ, ключ аренды):
+        свежий или устаревший ответ, если его можно отдать, либо
+        ключ аренды, захваченной для обновления устаревшего ответа.
+        Если ответа в кеше нет, возвращает (None, None).
+        """
+        entry = response_cache.get_entry(request)
+        if entry is None:
+            return None, None
+        if response_cache.is_fresh(entry, versions):
+            return self.build_response(entry, 'HIT'), None
+        key = response_cache.get_flight_key(request)
+        if response_cache.acquire_lease(key):
+            return None, key
+        return self.build_response(entry, 'STALE'), None
+
+    def rebuild(self, request, versions, lease_key=None):
+        """Строит ответ, сохраняет его в кеш и снимает аренду."""
+        try:
+            response = self.get_response(request)
+            self.store(request, response, versions)
+        finally:
+            if lease_key is not None:
+                response_cache.release_lease(lease_key)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    async def arebuild(self, request, versions, lease_key=None):
+        """Асинхронный вариант rebuild."""
+        try:
+            response = await self.get_response(request)
+            await sync_to_async(self.store)(request, response, versions)
+        finally:
+            if lease_key is not None:
+                await sync_to_async(response_cache.release_lease)(
+                    lease_key
+                )
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def is_cacheable(self, response):
+        """Проверяет, сохраняется ли ответ в кеш."""
+        return response.status_code == 200 and not response.streaming
+
+    def store(self, request, response, versions):
+        """Сохраняет успешный ответ в кеш."""
+        if self.is_cacheable(response):
+            response_cache.store_response(
+                response_cache.learn_vary_headers(request, response),
+                response,
+                versions,
+            )
+
+    def build_response(self, entry, status):
+        """Восстанавливает ответ из кеша или возвращает None."""
+        if entry is None:
+            return None
+        response = HttpResponse(entry['content'], status=entry['status'])
+        for header, value in entry['headers']:
+            response[header] = value
+        response['X-Cache'] = status
+        return response
+
+
+class RequestMetricsMiddleware(SyncAndAsyncMiddleware):
+    """
+    Собирает метрики запросов для /api/metrics/: длительность,
+    число и время запросов к базе, время сериализации и размер
+    ответа с метками имени представления и метода. Для потокового
+    ответа метрики учитываются, когда тело отправлено целиком.
+    """
+
+    def call(self, request):
+        stats = metrics.RequestStats()
+        token = metrics.current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.current_stats.reset(token)
+        return self.observe(request, response, stats, start)
+
+    async def acall(self, request):
+        stats = metrics.RequestStats()
+        token = metrics.current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.current_stats.reset(token)
+        return self.observe(request, response, stats, start)
+
+    def observe(self, request, response, stats, start):
+        """Записывает метрики или откладывает их до конца потока."""
+        labels = metrics.get_labels(request)
+        if response.streaming:
+            response.streaming_content = self.iter_measured(
+                response.streaming_content, labels, stats, start
+            )
+        else:
+            metrics.observe_request(
+                labels, stats, time.perf_counter() - start,
+                len(response.content),
+            )
+        return response
+
+    def iter_measured(self, content, labels, stats, start):
+        """
+        Отдает потоковый ответ, учитывая запросы к базе
+        при получении каждой части и общий размер.
+        """
+        size = 0
+        for chunk in iter_with(content, metrics.current_stats, stats):
+            size += len(chunk)
+            yield chunk
+        metrics.observe_request(
+            labels, stats, time.perf_counter() - start, size
+        )
+
+
+class QueryLogMiddleware(SyncAndAsyncMiddleware):
+    """
+    Журнал SQL-запросов для разработки и тестовых стендов.
+    Включается QUERY_LOG_ENABLED. Записывает в логгер
+    api.query_log запросы дольше QUERY_LOG_SLOW_SECONDS и запросы
+    с одинаковым отпечатком, выполненные за один запрос к API
+    больше QUERY_LOG_REPEAT_LIMIT раз, с именем представления
+    и стеком вызовов.
+    """
+
+    def call(self, request):
+        if not settings.QUERY_LOG_ENABLED:
+            return self.get_response(request)
+        log = query_log.QueryLog(request)
+        token = query_log.current_log.set(log)
+        try:
+            response = self.get_response(request)
+        finally:
+            query_log.current_log.reset(token)
+        return self.finish(response, log)
+
+    async def acall(self, request):
+        if not settings.QUERY_LOG_ENABLED:
+            return await self.get_response(request)
+        log = query_log.QueryLog(request)
+        token = query_log.current_log.set(log)
+        try:
+            response = await self.get_response(request)
+        finally:
+            query_log.current_log.reset(token)
+        return self.finish(response, log)
+
+    def finish(self, response, log):
+        """Записывает журнал или откладывает его до конца потока."""
+        if response.streaming:
+            response.streaming_content = self.iter_logged(
+                response.streaming_content, log
+            )
+        else:
+            log.finish()
+        return response
+
+    def iter_logged(self, content, log):
+        """Отдает потоковый ответ и записывает журнал в конце."""
+        yield from iter_with(content, query_log.current_log, log)
+        log.finish()
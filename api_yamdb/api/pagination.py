@@ -0,0 +1,79 @@
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import prefetch_related_objects
+from django.http import StreamingHttpResponse
+from rest_framework.pagination import LimitOffsetPagination
+
+from api.renderers import StreamingJSONRenderer
+from reviews.csv_utils import iter_batches
+
+
+def is_streamed_page(request):
+    """
+    Проверяет по параметрам запроса Django, что запрошена страница,
+    которую потоковая пагинация отдает потоком. Такие страницы
+    не кешируются, на каком бы пути их ни запросили.
+    """
+    try:
+        limit = int(request.GET[LimitOffsetPagination.limit_query_param])
+    except (KeyError, ValueError):
+        return False
+    return limit >= settings.STREAMING_PAGE_SIZE
+
+
+class StreamingLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Пагинация limit/offset, которая отдает большие страницы потоком.
+
+    Если limit не меньше STREAMING_PAGE_SIZE, строки читаются
+    итератором запроса пачками по STREAMING_BATCH_SIZE, связанные
+    объекты подгружаются для каждой пачки отдельно, а JSON
+    отправляется клиенту по мере сериализации. Время до первого байта
+    и память не зависят от размера страницы.
+    """
+
+    def should_stream(self, request):
+        """Проверяет, нужно ли отдавать страницу потоком."""
+        limit = self.get_limit(request)
+        return limit is not None and limit >= settings.STREAMING_PAGE_SIZE
+
+    def paginate_queryset_in_batches(self, queryset, request, view=None):
+        """
+        Аналог paginate_queryset, который возвращает не список,
+        а итератор пачек объектов страницы.
+        """
+        self.limit = self.get_limit(request)
+        self.count = self.get_count(queryset)
+        self.offset = self.get_offset(request)
+        self.request = request
+        return self.iter_batches(
+            queryset[self.offset:self.offset + self.limit]
+        )
+
+    def iter_batches(self, queryset):
+        """
+        Читает объекты итератором запроса и подгружает связанные
+        объекты для каждой пачки: в Django 3.2 iterator()
+        не выполняет prefetch_related.
+        """
+        prefetch = queryset._prefetch_related_lookups
+        rows = queryset.prefetch_related(None).iterator(
+            chunk_size=settings.STREAMING_BATCH_SIZE
+        )
+        for batch in iter_batches(rows, settings.STREAMING_BATCH_SIZE):
+            prefetch_related_objects(batch, *prefetch)
+            yield batch
+
+    def get_streaming_response(self, batches):
+        """Возвращает потоковый ответ со страницей."""
+        page = OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ])
+        renderer = StreamingJSONRenderer()
+        return StreamingHttpResponse(
+            renderer.iter_render(page, batches),
+            content_type=renderer.media_type,
+        )
@@ -0,0 +1,112 @@
+import logging
+import re
+import time
+import traceback
+from collections import Counter
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from api import metrics
+
+logger = logging.getLogger(__name__)
+
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+
+NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+PLACEHOLDER_RE = re.compile(r'%s|\?')
+
+IN_LIST_RE = re.compile(r'\bIN \((?:\?, )*\?\)', re.IGNORECASE)
+
+SPACE_RE = re.compile(r'\s+')
+
+# Модули оберток выполнения SQL, их кадры в стек не попадают.
+WRAPPER_FILES = (__file__, metrics.__file__)
+
+# Журнал текущего запроса. Задается QueryLogMiddleware.
+current_log = ContextVar('current_log', default=None)
+
+
+def fingerprint(sql):
+    """
+    Возвращает отпечаток SQL-запроса: литералы и параметры
+    заменяются на ?, а списки IN любой длины — на IN (...).
+    Запросы, отличающиеся только значениями, совпадают.
+    """
+    sql = STRING_RE.sub('?', sql)
+    sql = NUMBER_RE.sub('?', sql)
+    sql = PLACEHOLDER_RE.sub('?', sql)
+    sql = IN_LIST_RE.sub('IN (...)', sql)
+    return SPACE_RE.sub(' ', sql).strip()
+
+
+def get_stack():
+    """
+    Возвращает стек вызовов кода проекта без кадров библиотек,
+    а если таких кадров нет — полный стек.
+    """
+    stack = traceback.extract_stack()
+    base_dir = str(settings.BASE_DIR)
+    own = [
+        frame for frame in stack
+        if frame.filename.startswith(base_dir)
+        and 'site-packages' not in frame.filename
+        and frame.filename not in WRAPPER_FILES
+    ]
+    return ''.join(traceback.format_list(own or stack))
+
+
+def get_view_name(request):
+    """Возвращает имя представления запроса."""
+    match = request.resolver_match
+    return match.view_name if match else 'unresolved'
+
+
+class QueryLog:
+    """
+    Журнал SQL-запросов одного запроса к API.
+    Медленные запросы записываются сразу, а повторы одного
+    отпечатка сверх QUERY_LOG_REPEAT_LIMIT — по завершении запроса
+    со стеком вызовов первого лишнего повтора.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.counts = Counter()
+        self.stacks = {}
+
+    def record(self, sql, seconds):
+        """Учитывает выполненный SQL-запрос."""
+        key = fingerprint(sql)
+        self.counts[key] += 1
+        if self.counts[key] == settings.QUERY_LOG_REPEAT_LIMIT + 1:
+            self.stacks[key] = get_stack()
+        if seconds >= settings.QUERY_LOG_SLOW_SECONDS:
+            logger.warning(
+                'Медленный запрос %.3f с в %s %s (%s):\n%s\n%s',
+                seconds, self.request.method, self.request.path,
+                get_view_name(self.request), sql, get_stack(),
+            )
+
+    def finish(self):
+        """Записывает в журнал повторяющиеся запросы."""
+        for key, stack in self.stacks.items():
+            logger.warning(
+                'Запрос выполнен %d раз в %s %s (%s), возможно N+1:\n'
+                '%s\n%s',
+                self.counts[key], self.request.method, self.request.path,
+                get_view_name(self.request), key, stack,
+            )
+
+
+def log_query(execute, sql, params, many, context):
+    """Обертка выполнения SQL для журнала текущего запроса."""
+    log = current_log.get()
+    if log is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        log.record(sql, time.perf_counter() - start)
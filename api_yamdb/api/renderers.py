@@ -0,0 +1,22 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class StreamingJSONRenderer(JSONRenderer):
+    """
+    JSON-рендерер страницы, который отдает ее частями.
+    Каждая пачка строк кодируется отдельно, поэтому в памяти
+    не собираются ни вся страница, ни вся JSON-строка.
+    """
+
+    def iter_render(self, page, batches):
+        """
+        Возвращает итератор байтов JSON-объекта page,
+        в котором results заполняется строками из batches.
+        """
+        yield self.render(dict(page, results=[]))[:-2]
+        separator = b''
+        for rows in batches:
+            if rows:
+                yield separator + self.render(rows)[1:-1]
+                separator = b','
+        yield b']}'
@@ -0,0 +1,274 @@
+import asyncio
+import hashlib
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import cc_delim_re
+
+VERSION_KEY = 'response-version:{}'
+
+VARY_KEY = 'response-vary:{}'
+
+ENTRY_KEY = 'response:{}'
+
+LEASE_KEY = 'response-lease:{}'
+
+# Построения ответов внутри процесса: ключ -> Flight.
+flight_locks = {}
+
+flight_locks_guard = threading.Lock()
+
+# То же для асинхронных запросов одного цикла событий.
+async_flight_locks = {}
+
+
+class Flight:
+    """
+    Построение одного ответа запросами процесса.
+    users — число запросов, которые держат блокировку или ждут ее.
+    Если владелец блокировки не сохранил ответ, passthrough
+    отпускает ждущих строить ответ параллельно, а не по очереди.
+    """
+
+    def __init__(self, lock):
+        self.lock = lock
+        self.users = 0
+        self.passthrough = False
+
+
+def get_cache():
+    """Возвращает кеш ответов."""
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def get_resources(path):
+    """
+    Возвращает ресурсы, от которых зависит ответ на path,
+    или None, если ответ не кешируется.
+    """
+    for prefix, resources in settings.RESPONSE_CACHE_PATHS.items():
+        if path.startswith(prefix):
+            return resources
+    return None
+
+
+def get_versions(resources):
+    """Возвращает текущие версии ресурсов одним запросом к кешу."""
+    keys = [VERSION_KEY.format(resource) for resource in resources]
+    versions = get_cache().get_many(keys)
+    return [versions.get(key, 0) for key in keys]
+
+
+def bump_versions(*resources):
+    """
+    Увеличивает версии ресурсов после записи.
+    Закешированные ответы, зависящие от них, становятся устаревшими.
+    """
+    cache = get_cache()
+    for resource in resources:
+        key = VERSION_KEY.format(resource)
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def normalize_query(request):
+    """Возвращает параметры запроса в отсортированном виде."""
+    return urlencode(sorted(request.GET.lists()), doseq=True)
+
+
+def get_entry(request):
+    """Возвращает закешированный ответ на запрос или None."""
+    key = find_entry_key(request)
+    return get_cache().get(key) if key else None
+
+
+def get_entry_key(request, vary_headers):
+    """
+    Возвращает ключ ответа: путь, отсортированные параметры
+    и значения заголовков из Vary ответа.
+    """
+    parts = [request.path, normalize_query(request)]
+    parts.extend(
+        request.META.get(
+            'HTTP_' + header.upper().replace('-', '_'), ''
+        )
+        for header in vary_headers
+    )
+    return ENTRY_KEY.format(
+        hashlib.md5('\n'.join(parts).encode()).hexdigest()
+    )
+
+
+def get_vary_headers(response):
+    """Возвращает заголовки из Vary ответа."""
+    if not response.has_header('Vary'):
+        return []
+    return sorted(
+        header.lower() for header in cc_delim_re.split(response['Vary'])
+    )
+
+
+def learn_vary_headers(request, response):
+    """
+    Запоминает заголовки Vary для пути и возвращает ключ ответа.
+    """
+    vary_headers = get_vary_headers(response)
+    get_cache().set(
+        VARY_KEY.format(request.path), vary_headers, timeout=None
+    )
+    return get_entry_key(request, vary_headers)
+
+
+def get_flight_key(request):
+    """
+    Возвращает ключ, по которому объединяются запросы, строящие
+    один ответ. Пока заголовки Vary пути неизвестны, ключ строится
+    только по пути и параметрам.
+    """
+    return find_entry_key(request) or get_entry_key(request, [])
+
+
+def find_entry_key(request):
+    """
+    Возвращает ключ ответа по запомненным заголовкам Vary
+    или None, если путь еще не запрашивался.
+    """
+    vary_headers = get_cache().get(VARY_KEY.format(request.path))
+    if vary_headers is None:
+        return None
+    return get_entry_key(request, vary_headers)
+
+
+def store_response(key, response, versions):
+    """Сохраняет ответ вместе с версиями ресурсов и временем создания."""
+    get_cache().set(
+        key,
+        {
+            'status': response.status_code,
+            'content': response.content,
+            'headers': list(response.items()),
+            'versions': versions,
+            'created': time.time(),
+        },
+        timeout=(
+            settings.RESPONSE_CACHE_SECONDS
+            + settings.RESPONSE_CACHE_STALE_SECONDS
+        ),
+    )
+
+
+def is_fresh(entry, versions):
+    """Проверяет, что ответ не устарел ни по версиям, ни по времени."""
+    return (
+        entry['versions'] == versions
+        and time.time() - entry['created'] < settings.RESPONSE_CACHE_SECONDS
+    )
+
+
+def acquire_lease(key):
+    """
+    Захватывает право обновить устаревший ответ.
+    Пока аренда действует, остальные запросы получают старый ответ.
+    """
+    return get_cache().add(
+        LEASE_KEY.format(key), True, settings.RESPONSE_CACHE_STALE_SECONDS
+    )
+
+
+def release_lease(key):
+    """Освобождает аренду обновления ответа."""
+    get_cache().delete(LEASE_KEY.format(key))
+
+
+@contextmanager
+def local_flight(key):
+    """
+    Пропускает к построению ответа key один поток процесса,
+    остальные ждут не дольше RESPONSE_CACHE_WAIT_SECONDS.
+    Возвращает общий для них Flight. Он удаляется, когда
+    его больше никто не ждет.
+    """
+    with flight_locks_guard:
+        flight = flight_locks.setdefault(key, Flight(threading.Lock()))
+        flight.users += 1
+    acquired = flight.lock.acquire(
+        timeout=settings.RESPONSE_CACHE_WAIT_SECONDS
+    )
+    try:
+        yield flight
+    finally:
+        if acquired:
+            flight.lock.release()
+        with flight_locks_guard:
+            flight.users -= 1
+            if not flight.users:
+                del flight_locks[key]
+
+
+@asynccontextmanager
+async def async_flight(key):
+    """Асинхронный вариант local_flight для запросов под ASGI."""
+    flight = async_flight_locks.setdefault(key, Flight(asyncio.Lock()))
+    flight.users += 1
+    try:
+        await asyncio.wait_for(
+            flight.lock.acquire(), settings.RESPONSE_CACHE_WAIT_SECONDS
+        )
+        acquired = True
+    except asyncio.TimeoutError:
+        acquired = False
+    try:
+        yield flight
+    finally:
+        if acquired:
+            flight.lock.release()
+        flight.users -= 1
+        if not flight.users:
+            del async_flight_locks[key]
+
+
+def poll_entry(request, key, versions):
+    """
+    Проверяет, сохранил ли держатель аренды key ответ.
+    Возвращает пару (ожидание окончено, свежий ответ или None).
+    """
+    entry = get_entry(request)
+    if entry is not None and is_fresh(entry, versions):
+        return True, entry
+    return get_cache().get(LEASE_KEY.format(key)) is None, None
+
+
+def wait_for_entry(request, key, versions):
+    """
+    Ждет, пока другой процесс, захвативший аренду key, сохранит
+    ответ. Возвращает свежий ответ или None, если аренда снята
+    без ответа или ожидание дольше RESPONSE_CACHE_WAIT_SECONDS.
+    """
+    deadline = time.monotonic() + settings.RESPONSE_CACHE_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(settings.RESPONSE_CACHE_POLL_SECONDS)
+        finished, entry = poll_entry(request, key, versions)
+        if finished:
+            return entry
+    return None
+
+
+async def await_entry(request, key, versions):
+    """Асинхронный вариант wait_for_entry."""
+    deadline = time.monotonic() + settings.RESPONSE_CACHE_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        await asyncio.sleep(settings.RESPONSE_CACHE_POLL_SECONDS)
+        finished, entry = await sync_to_async(poll_entry)(
+            request, key, versions
+        )
+        if finished:
+            return entry
+    return None
@@ -3,15 +3,39 @@ from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
+from rest_framework.fields import empty
 from rest_framework.exceptions import ValidationError
 
-from api_yamdb.consts import LENGTH_EMAIL, LENGTH_USERNAME
+from api.metrics import serializer_timer
+from api_yamdb.consts import BULK_USERS_MAX, LENGTH_EMAIL, LENGTH_USERNAME
 from reviews.models import Category, Comment, Genre, Review, Title
 from reviews.validators import username_validator
 from users.models import User
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class MeasuredSerializerMixin:
+    """Учитывает время сериализации и валидации в метриках запроса."""
+
+    def to_representation(self, instance):
+        with serializer_timer():
+            return super().to_representation(instance)
+
+    def run_validation(self, data=empty):
+        with serializer_timer():
+            return super().run_validation(data)
+
+
+class MeasuredSerializer(MeasuredSerializerMixin, serializers.Serializer):
+    """Сериализатор с учетом времени в метриках запроса."""
+
+
+class MeasuredModelSerializer(
+    MeasuredSerializerMixin, serializers.ModelSerializer
+):
+    """Сериализатор модели с учетом времени в метриках запроса."""
+
+
+class GenreSerializer(MeasuredModelSerializer):
     """Сериализатор для жанров."""
 
     class Meta:
@@ -19,7 +43,7 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(MeasuredModelSerializer):
     """Сериализатор для категорий."""
 
     class Meta:
@@ -27,7 +51,7 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class TitleGetSerializer(serializers.ModelSerializer):
+class TitleGetSerializer(MeasuredModelSerializer):
     """Сериализатор для получения произведений."""
 
     category = CategorySerializer(read_only=True)
@@ -41,7 +65,7 @@ class TitleGetSerializer(serializers.ModelSerializer):
         )
 
 
-class TitleWriteSerializer(serializers.ModelSerializer):
+class TitleWriteSerializer(MeasuredModelSerializer):
     """Сериализатор для изменения произведений."""
 
     category = serializers.SlugRelatedField(
@@ -70,7 +94,7 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         return value
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(MeasuredModelSerializer):
     """Миксин сериализатор поля автора."""
 
     author = serializers.SlugRelatedField(
@@ -113,7 +137,7 @@ class CommentSerializer(AuthorSerializer):
         read_only_fields = ('review',)
 
 
-class AdminUserSerializer(serializers.ModelSerializer):
+class AdminUserSerializer(MeasuredModelSerializer):
     """Сериализатор для администратора."""
 
     class Meta:
@@ -138,7 +162,27 @@ class UserSerializer(AdminUserSerializer):
         read_only_fields = ('role',)
 
 
-class SignUpSerializer(serializers.Serializer):
+class BulkUserSerializer(MeasuredSerializer):
+    """Сериализатор списка пользователей для массовых действий."""
+
+    usernames = serializers.ListField(
+        child=serializers.CharField(max_length=LENGTH_USERNAME),
+        allow_empty=False,
+        max_length=BULK_USERS_MAX,
+    )
+
+    def validate_usernames(self, value):
+        """Удаляет повторы, сохраняя порядок."""
+        return list(dict.fromkeys(value))
+
+
+class BulkRoleSerializer(BulkUserSerializer):
+    """Сериализатор для массовой смены роли."""
+
+    role = serializers.ChoiceField(choices=User.Role.choices)
+
+
+class SignUpSerializer(MeasuredSerializer):
     """Сериализатор для регистрации пользователя."""
 
     username = serializers.CharField(
@@ -183,7 +227,7 @@ class SignUpSerializer(serializers.Serializer):
         return user
 
 
-class GetTokenSerializer(serializers.Serializer):
+class GetTokenSerializer(MeasuredSerializer):
     """Сериализатор для получения токена."""
 
     username = serializers.CharField(
@@ -0,0 +1,69 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.metrics import record_query
+from api.query_log import log_query
+from api.response_cache import bump_versions
+from reviews.models import Category, Comment, Genre, Review, Title, TitleStats
+from reviews.signals import data_changed
+
+# Ресурсы кеша ответов, которые изменяются при записи в модель.
+MODEL_RESOURCES = {
+    Title: 'titles',
+    Title.genre.through: 'titles',
+    Genre: 'genres',
+    Category: 'categories',
+    Review: 'reviews',
+    TitleStats: 'reviews',
+    Comment: 'comments',
+}
+
+
+def bump_models(models, using=None):
+    """
+    Увеличивает версии ресурсов, соответствующих моделям.
+    Версии увеличиваются после фиксации транзакции: иначе
+    параллельный запрос мог бы построить ответ по еще не
+    зафиксированным данным и сохранить его с новыми версиями.
+    """
+    resources = {
+        MODEL_RESOURCES[model] for model in models
+        if model in MODEL_RESOURCES
+    }
+    if resources:
+        transaction.on_commit(
+            lambda: bump_versions(*sorted(resources)), using=using
+        )
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def model_changed(sender, using=None, **kwargs):
+    """Сбрасывает кеш ответов после записи в модель."""
+    bump_models((sender,), using)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, action, using=None, **kwargs):
+    """Сбрасывает кеш ответов после изменения жанров произведения."""
+    if action.startswith('post_'):
+        bump_models((sender,), using)
+
+
+@receiver(data_changed)
+def data_imported(sender, models, **kwargs):
+    """Сбрасывает кеш ответов после записи в обход сигналов моделей."""
+    bump_models(models)
+
+
+@receiver(connection_created)
+def wrap_queries(sender, connection, **kwargs):
+    """
+    Подключает к новому соединению учет SQL-запросов в метриках
+    и журнале запросов.
+    """
+    for wrapper in (record_query, log_query):
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wrapper)
@@ -0,0 +1,201 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+LOCAL_STORAGE = 'local'
+CACHE_STORAGE = 'cache'
+
+
+class BucketStorageMixin:
+    """Общая логика алгоритма token bucket для хранилищ корзин."""
+
+    def refill(self, state, capacity, refill_rate, now):
+        """Возвращает количество токенов в корзине на момент now."""
+        if state is None:
+            return capacity
+        tokens, updated = state[:2]
+        return min(capacity, tokens + (now - updated) * refill_rate)
+
+    def take(self, tokens, refill_rate):
+        """Забирает токен из корзины, если он есть."""
+        if tokens >= 1:
+            return True, tokens - 1, 0
+        return False, tokens, (1 - tokens) / refill_rate
+
+
+class LocalBucketStorage(BucketStorageMixin):
+    """
+    Хранилище корзин в памяти процесса.
+    Корзины хранятся в порядке последнего обращения. Наполнившиеся
+    корзины удаляются из начала очереди, а если корзин все еще
+    не меньше max_entries — самые давно использованные. Обе операции
+    не зависят от числа корзин.
+    """
+
+    max_entries = 10000
+
+    def __init__(self):
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate):
+        """Списывает токен из корзины key, возвращает (разрешено, ожидание)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens = self.refill(
+                self._buckets.get(key), capacity, refill_rate, now
+            )
+            allowed, tokens, wait = self.take(tokens, refill_rate)
+            full_at = now + (capacity - tokens) / refill_rate
+            self._buckets[key] = (tokens, now, full_at)
+            self._buckets.move_to_end(key)
+            self._evict(now)
+        return allowed, wait
+
+    def delete(self, keys):
+        """Удаляет корзины с указанными ключами."""
+        with self._lock:
+            for key in keys:
+                self._buckets.pop(key, None)
+
+    def clear(self):
+        """Очищает все корзины."""
+        with self._lock:
+            self._buckets.clear()
+
+    def _evict(self, now):
+        """
+        Удаляет наполнившиеся корзины из начала очереди, а затем самые
+        давно использованные, пока корзин больше max_entries.
+        """
+        while self._buckets:
+            key, state = next(iter(self._buckets.items()))
+            if state[2] > now:
+                break
+            del self._buckets[key]
+        while len(self._buckets) > self.max_entries:
+            self._buckets.popitem(last=False)
+
+
+class CacheBucketStorage(BucketStorageMixin):
+    """
+    Хранилище корзин в кеше Django.
+    Позволяет разделять лимиты между процессами. Чтение и запись
+    не атомарны, поэтому при гонке лимит может быть превышен
+    на единицы запросов.
+    """
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def consume(self, key, capacity, refill_rate):
+        """Списывает токен из корзины key, возвращает (разрешено, ожидание)."""
+        now = time.time()
+        tokens = self.refill(self.cache.get(key), capacity, refill_rate, now)
+        allowed, tokens, wait = self.take(tokens, refill_rate)
+        timeout = (capacity - tokens) / refill_rate
+        self.cache.set(key, (tokens, now), max(1, int(timeout) + 1))
+        return allowed, wait
+
+    def delete(self, keys):
+        """Удаляет корзины с указанными ключами."""
+        self.cache.delete_many(list(keys))
+
+    def clear(self):
+        """Кеш общий с другими данными, поэтому не очищается целиком."""
+
+
+local_storage = LocalBucketStorage()
+
+
+def get_bucket_storage():
+    """Возвращает хранилище корзин согласно настройкам проекта."""
+    if settings.AUTH_THROTTLE_STORAGE == CACHE_STORAGE:
+        return CacheBucketStorage(settings.AUTH_THROTTLE_CACHE_ALIAS)
+    return local_storage
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Базовый троттлинг по алгоритму token bucket.
+    Скоуп берется из атрибута throttle_scope представления и дополняется
+    суффиксом, например signup_ip. Частота 5/hour задает емкость корзины
+    в 5 запросов с равномерным пополнением в течение часа.
+    """
+
+    scope_suffix = None
+
+    def __init__(self):
+        self.wait_time = None
+
+    def allow_request(self, request, view):
+        """Проверяет, остались ли токены в корзине клиента."""
+        base_scope = getattr(view, 'throttle_scope', None)
+        if not base_scope:
+            return True
+        self.scope = f'{base_scope}_{self.scope_suffix}'
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.num_requests is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        allowed, self.wait_time = get_bucket_storage().consume(
+            self.key, self.num_requests, self.num_requests / self.duration
+        )
+        return allowed
+
+    def wait(self):
+        """Возвращает время в секундах до появления токена."""
+        return self.wait_time
+
+
+class AuthIPThrottle(TokenBucketThrottle):
+    """Ограничение запросов к эндпоинтам авторизации по IP-адресу."""
+
+    scope_suffix = 'ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request),
+        }
+
+
+class AuthUsernameThrottle(TokenBucketThrottle):
+    """Ограничение запросов к эндпоинтам авторизации по username."""
+
+    scope_suffix = 'username'
+
+    def get_cache_key(self, request, view):
+        data = request.data
+        username = data.get('username') if hasattr(data, 'get') else None
+        if not isinstance(username, str) or not username:
+            return None
+        return get_username_throttle_key(self.scope, username)
+
+
+def get_username_throttle_key(scope, username):
+    """Возвращает ключ корзины для пары скоуп - username."""
+    return AuthUsernameThrottle.cache_format % {
+        'scope': scope,
+        'ident': username.lower(),
+    }
+
+
+def reset_username_throttles(usernames):
+    """Сбрасывает корзины username-троттлинга для указанных пользователей."""
+    scopes = [
+        scope for scope in TokenBucketThrottle.THROTTLE_RATES
+        if scope.endswith(f'_{AuthUsernameThrottle.scope_suffix}')
+    ]
+    get_bucket_storage().delete(
+        get_username_throttle_key(scope, username)
+        for scope in scopes
+        for username in usernames
+    )
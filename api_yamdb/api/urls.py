@@ -10,6 +10,7 @@ from api.views import (
     ReviewViewSet,
     TitleViewSet,
     UserViewSet,
+    metrics_view,
 )
 
 router_v1 = DefaultRouter()
@@ -57,4 +58,5 @@ v1_patterns = [
 
 urlpatterns = [
     path('v1/', include(v1_patterns)),
+    path('metrics/', metrics_view, name='metrics'),
 ]
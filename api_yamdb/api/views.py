@@ -1,15 +1,23 @@
-from django.db.models import Avg
+from hmac import compare_digest
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework.views import APIView
 
-from api.filters import TitleFilter
+from api.filters import TitleFilter, UserSearchFilter
+from api import metrics
+from api.pagination import StreamingLimitOffsetPagination
 from api.permissions import (
     IsAdmin,
     IsAdminModeratorAuthorReadOnly,
@@ -17,6 +25,8 @@ from api.permissions import (
 )
 from api.serializers import (
     AdminUserSerializer,
+    BulkRoleSerializer,
+    BulkUserSerializer,
     CategorySerializer,
     CommentSerializer,
     GenreSerializer,
@@ -27,8 +37,14 @@ from api.serializers import (
     TitleWriteSerializer,
     UserSerializer
 )
+from api.throttling import (
+    AuthIPThrottle,
+    AuthUsernameThrottle,
+    reset_username_throttles
+)
 from api_yamdb.consts import CANT_USED_IN_USERNAME
 from reviews.models import Category, Genre, Review, Title
+from reviews.signals import data_changed
 from users.models import User
 
 
@@ -60,14 +76,39 @@ class CategoryViewSet(GenreCategoryMixin):
     serializer_class = CategorySerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class StreamingListMixin:
+    """
+    Отдает большие страницы списка потоком JSON, если пагинатор
+    это поддерживает и клиент запросил JSON.
+    """
+
+    def list(self, request, *args, **kwargs):
+        paginator = self.paginator
+        if not (
+            isinstance(paginator, StreamingLimitOffsetPagination)
+            and isinstance(request.accepted_renderer, JSONRenderer)
+            and paginator.should_stream(request)
+        ):
+            return super().list(request, *args, **kwargs)
+        batches = paginator.paginate_queryset_in_batches(
+            self.filter_queryset(self.get_queryset()), request, self
+        )
+        return paginator.get_streaming_response(
+            self.get_serializer(batch, many=True).data for batch in batches
+        )
+
+
+class TitleViewSet(StreamingListMixin, viewsets.ModelViewSet):
     """View-класс для произведения."""
 
     permission_classes = (IsAdminOrReadOnly,)
     queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).order_by('rating').all()
+        rating=F('stats__rating')
+    ).select_related('category').prefetch_related(
+        'genre'
+    ).order_by('rating')
     serializer_class = TitleGetSerializer
+    pagination_class = StreamingLimitOffsetPagination
     filter_backends = (DjangoFilterBackend, filters.OrderingFilter)
     filterset_class = TitleFilter
     ordering_fields = ('rating', 'year', 'name')
@@ -80,11 +121,12 @@ class TitleViewSet(viewsets.ModelViewSet):
         return TitleWriteSerializer
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(StreamingListMixin, viewsets.ModelViewSet):
     """ViewSet для отзывов."""
 
     permission_classes = (IsAdminModeratorAuthorReadOnly,)
     serializer_class = ReviewSerializer
+    pagination_class = StreamingLimitOffsetPagination
     http_method_names = ('get', 'post', 'patch', 'delete')
 
     def get_title(self):
@@ -93,7 +135,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Получает запрос для всех отзывов данного произведения."""
-        return self.get_title().reviews.all()
+        return self.get_title().reviews.select_related('author')
 
     def perform_create(self, serializer):
         """Создает новый отзыв."""
@@ -126,7 +168,7 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     permission_classes = (IsAdmin,)
     serializer_class = AdminUserSerializer
-    filter_backends = (SearchFilter,)
+    filter_backends = (UserSearchFilter,)
     search_fields = ('username',)
     lookup_field = 'username'
     http_method_names = ('get', 'post', 'patch', 'delete')
@@ -154,10 +196,58 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=['post'], url_path='bulk/set-role')
+    def bulk_set_role(self, request):
+        """Массовая смена роли пользователей."""
+        serializer = BulkRoleSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return self.bulk_update(
+            serializer.validated_data['usernames'],
+            role=serializer.validated_data['role'],
+        )
+
+    @action(detail=False, methods=['post'], url_path='bulk/deactivate')
+    def bulk_deactivate(self, request):
+        """Массовая деактивация пользователей."""
+        serializer = BulkUserSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return self.bulk_update(
+            serializer.validated_data['usernames'],
+            is_active=False,
+        )
+
+    def bulk_update(self, usernames, **fields):
+        """
+        Обновляет пользователей одним UPDATE в транзакции.
+        Собственная учетная запись администратора не изменяется.
+        """
+        with transaction.atomic():
+            found = set(
+                User.objects.filter(username__in=usernames)
+                .exclude(pk=self.request.user.pk)
+                .values_list('username', flat=True)
+            )
+            User.objects.filter(username__in=found).update(**fields)
+        data_changed.send(sender=User, models=(User,))
+        reset_username_throttles(found)
+        results = []
+        for username in usernames:
+            if username in found:
+                result = 'updated'
+            elif username == self.request.user.username:
+                result = 'skipped'
+            else:
+                result = 'not_found'
+            results.append({'username': username, 'status': result})
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
 
 class APISignup(APIView):
     """Создает нового пользователя."""
 
+    throttle_classes = (AuthIPThrottle, AuthUsernameThrottle)
+    throttle_scope = 'signup'
+
     def post(self, request):
         """Обрабатывает POST-запрос для регистрации пользователя."""
         serializer = SignUpSerializer(data=request.data)
@@ -170,6 +260,9 @@ class APISignup(APIView):
 class APIGetToken(APIView):
     """Работа с JWT токеном."""
 
+    throttle_classes = (AuthIPThrottle, AuthUsernameThrottle)
+    throttle_scope = 'token'
+
     def post(self, request):
         """Обрабатывает POST-запрос для генерации токена."""
         serializer = GetTokenSerializer(data=request.data)
@@ -177,3 +270,22 @@ class APIGetToken(APIView):
         access_token = AccessToken.for_user()
         access_token_data = {'token': str(access_token)}
         return Response(access_token_data, status=status.HTTP_200_OK)
+
+
+def metrics_view(request):
+    """
+    Отдает метрики запросов в текстовом формате Prometheus.
+    Доступно с адресов из METRICS_ALLOWED_IPS или с заголовком
+    Authorization: Bearer <METRICS_TOKEN>.
+    """
+    token = settings.METRICS_TOKEN
+    authorized = bool(token) and compare_digest(
+        request.META.get('HTTP_AUTHORIZATION', '').encode(),
+        f'Bearer {token}'.encode(),
+    )
+    if not (
+        authorized
+        or request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+    ):
+        raise Http404
+    return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE)
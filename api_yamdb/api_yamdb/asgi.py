@@ -1,7 +1,41 @@
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+
+def collect_streaming_response(response):
+    """Собирает потоковый ответ в обычный с теми же заголовками."""
+    collected = HttpResponse(
+        b''.join(response.streaming_content), status=response.status_code
+    )
+    for header, value in response.items():
+        collected[header] = value
+    response.close()
+    return collected
+
+
+class APIASGIHandler(ASGIHandler):
+    """
+    Обработчик ASGI, который собирает потоковые ответы в потоке.
+
+    ASGI-обработчик Django 3.2 перебирает потоковый ответ синхронно
+    в цикле событий, где запросы к базе запрещены.
+    """
+
+    async def get_response_async(self, request):
+        response = await super().get_response_async(request)
+        if response.streaming:
+            return await sync_to_async(collect_streaming_response)(
+                response
+            )
+        return response
+
+
+django.setup(set_prefix=False)
+
+application = APIASGIHandler()
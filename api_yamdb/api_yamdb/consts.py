@@ -1,11 +1,19 @@
+BULK_USERS_MAX = 1000
+
 CANT_USED_IN_USERNAME = 'me'
 
+LENGTH_CHECKSUM = 32
+
 LENGTH_EMAIL = 254
 
 LENGTH_NAME = 256
 
+LENGTH_PATH = 1024
+
 LENGTH_SLUG = 50
 
+LENGTH_TABLE_NAME = 63
+
 LENGTH_USERNAME = 150
 
 MAX_LENGTH = 30
@@ -25,6 +25,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.RequestMetricsMiddleware',
+    'api.middleware.QueryLogMiddleware',
+    'api.middleware.ReplicaPinningMiddleware',
+    'api.middleware.AnonymousResponseCacheMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -64,6 +68,50 @@ DATABASES = {
     }
 }
 
+DATABASE_ROUTERS = ['api.db_routers.ReplicaRouter']
+
+DATABASE_REPLICAS = []
+
+REPLICA_PIN_SECONDS = 5
+
+REPLICA_PIN_CACHE_ALIAS = 'default'
+
+# Кеш ответов и закреплений должен быть общим для всех процессов
+# (memcached и т.п.): версии ресурсов, увеличенные одним воркером,
+# иначе не доходят до других. См. проверку api.W001.
+RESPONSE_CACHE_ALIAS = 'default'
+
+RESPONSE_CACHE_SECONDS = 60
+
+RESPONSE_CACHE_STALE_SECONDS = 30
+
+# Сколько запрос ждет ответа, который строит другой запрос,
+# прежде чем построить его сам.
+RESPONSE_CACHE_WAIT_SECONDS = 5
+
+RESPONSE_CACHE_POLL_SECONDS = 0.05
+
+# Кешируемые пути и ресурсы, от которых зависят ответы на них.
+# Ответ по произведению включает отзывы и комментарии к ним.
+# От пользователей ответы не зависят: новое имя автора появится
+# в отзывах не позже чем через RESPONSE_CACHE_SECONDS.
+RESPONSE_CACHE_PATHS = {
+    '/api/v1/titles/': (
+        'titles', 'genres', 'categories', 'reviews', 'comments'
+    ),
+    '/api/v1/genres/': ('genres',),
+    '/api/v1/categories/': ('categories',),
+}
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'busy_timeout': 5000,
+    'synchronous': 'NORMAL',
+    'mmap_size': 268435456,
+    'cache_size': -65536,
+    'temp_store': 'MEMORY',
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -103,8 +151,61 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': '30/hour',
+        'signup_username': '5/hour',
+        'token_ip': '60/hour',
+        'token_username': '10/hour',
+    },
 }
 
+# Каталог, через который процессы объединяют метрики /api/metrics/.
+# Если не задан, каждый процесс отдает только свои метрики.
+METRICS_MULTIPROCESS_DIR = None
+
+METRICS_FLUSH_SECONDS = 1
+
+# Доступ к /api/metrics/: по REMOTE_ADDR или по заголовку
+# Authorization: Bearer <METRICS_TOKEN>. За обратным прокси на том же
+# сервере все запросы приходят с 127.0.0.1, поэтому там нужен токен.
+METRICS_ALLOWED_IPS = ['127.0.0.1']
+
+METRICS_TOKEN = None
+
+# Журнал SQL-запросов для разработки и тестовых стендов:
+# медленные запросы и повторы одного запроса (N+1).
+QUERY_LOG_ENABLED = DEBUG
+
+QUERY_LOG_SLOW_SECONDS = 0.1
+
+QUERY_LOG_REPEAT_LIMIT = 10
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api.query_log': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
+}
+
+# Страницы произведений и отзывов с limit от STREAMING_PAGE_SIZE
+# отдаются потоком пачками по STREAMING_BATCH_SIZE строк и не кешируются.
+STREAMING_PAGE_SIZE = 100
+
+STREAMING_BATCH_SIZE = 100
+
+AUTH_THROTTLE_STORAGE = 'local'
+
+AUTH_THROTTLE_CACHE_ALIAS = 'default'
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 SIMPLE_JWT = {
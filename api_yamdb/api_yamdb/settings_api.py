@@ -0,0 +1,50 @@
+"""
+Настройки процессов, которые обслуживают только API.
+
+Включаются переменной окружения
+DJANGO_SETTINGS_MODULE=api_yamdb.settings_api.
+Основаны на боевых настройках. API аутентифицирует клиентов по JWT
+и отдает только JSON, поэтому админка, сессии, сообщения, статика
+и их промежуточные слои исключены и из обработки запроса,
+и из INSTALLED_APPS.
+"""
+from copy import deepcopy
+
+from api_yamdb.settings_production import *  # noqa: F401, F403
+from api_yamdb.settings_production import (
+    INSTALLED_APPS as PRODUCTION_INSTALLED_APPS,
+    MIDDLEWARE as PRODUCTION_MIDDLEWARE,
+    TEMPLATES as PRODUCTION_TEMPLATES
+)
+
+EXCLUDED_APPS = (
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+)
+
+EXCLUDED_MIDDLEWARE = (
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'django.middleware.locale.LocaleMiddleware',
+)
+
+INSTALLED_APPS = [
+    app for app in PRODUCTION_INSTALLED_APPS if app not in EXCLUDED_APPS
+]
+
+MIDDLEWARE = [
+    middleware for middleware in PRODUCTION_MIDDLEWARE
+    if middleware not in EXCLUDED_MIDDLEWARE
+]
+
+ROOT_URLCONF = 'api_yamdb.urls_api'
+
+TEMPLATES = deepcopy(PRODUCTION_TEMPLATES)
+TEMPLATES[0]['OPTIONS']['context_processors'].remove(
+    'django.contrib.messages.context_processors.messages'
+)
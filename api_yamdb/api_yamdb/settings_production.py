@@ -0,0 +1,87 @@
+"""
+Настройки для боевого окружения.
+
+Включаются переменной окружения
+DJANGO_SETTINGS_MODULE=api_yamdb.settings_production.
+Значения, зависящие от окружения, задаются переменными DJANGO_*.
+"""
+import os
+from copy import deepcopy
+
+from django.core.exceptions import ImproperlyConfigured
+
+from api_yamdb.settings import *  # noqa: F401, F403
+from api_yamdb.settings import (
+    DATABASES as BASE_DATABASES,
+    REST_FRAMEWORK as BASE_REST_FRAMEWORK,
+    TEMPLATES as BASE_TEMPLATES
+)
+
+# Без DEBUG Django не хранит выполненные запросы в connection.queries,
+# и память долгоживущих процессов не растет.
+DEBUG = False
+
+# Ключ из репозитория в боевом окружении не используется.
+SECRET_KEY = os.getenv('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured(
+        'Задайте секретный ключ в переменной окружения DJANGO_SECRET_KEY.'
+    )
+
+# Без DJANGO_ALLOWED_HOSTS запросы не принимаются ни с одним Host.
+ALLOWED_HOSTS = [
+    host for host in os.getenv('DJANGO_ALLOWED_HOSTS', '').split(',') if host
+]
+
+TEMPLATES = deepcopy(BASE_TEMPLATES)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+TEMPLATES[0]['OPTIONS']['context_processors'].remove(
+    'django.template.context_processors.debug'
+)
+
+DATABASES = deepcopy(BASE_DATABASES)
+DATABASES['default']['NAME'] = os.getenv(
+    'DJANGO_DB_NAME', DATABASES['default']['NAME']
+)
+DATABASES['default']['CONN_MAX_AGE'] = int(
+    os.getenv('DJANGO_CONN_MAX_AGE', 60)
+)
+
+REST_FRAMEWORK = {
+    **BASE_REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+    ],
+}
+
+# Кеш ответов и закреплений общий для всех воркеров, например
+# DJANGO_CACHE_BACKEND=django.core.cache.backends.memcached.PyMemcacheCache
+# и DJANGO_CACHE_LOCATION=127.0.0.1:11211.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'DJANGO_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.getenv('DJANGO_CACHE_LOCATION', ''),
+    },
+}
+
+METRICS_MULTIPROCESS_DIR = os.getenv('DJANGO_METRICS_DIR') or None
+
+# Без явного списка адресов или токена метрики недоступны: за прокси
+# на том же сервере с 127.0.0.1 приходят и внешние запросы.
+METRICS_ALLOWED_IPS = [
+    ip for ip in os.getenv('DJANGO_METRICS_ALLOWED_IPS', '').split(',') if ip
+]
+
+METRICS_TOKEN = os.getenv('DJANGO_METRICS_TOKEN') or None
+
+# На тестовом стенде журнал SQL-запросов включается DJANGO_QUERY_LOG=1.
+QUERY_LOG_ENABLED = os.getenv('DJANGO_QUERY_LOG') == '1'
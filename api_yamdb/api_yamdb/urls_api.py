@@ -0,0 +1,6 @@
+from django.urls import include, path
+
+# Конфигурация URL процессов API: без админки и документации.
+urlpatterns = [
+    path('api/', include('api.urls')),
+]
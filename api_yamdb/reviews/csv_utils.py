@@ -0,0 +1,114 @@
+import bz2
+import csv
+import gzip
+from itertools import islice
+from pathlib import Path
+
+OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+}
+
+
+def open_csv(path, mode='r'):
+    """Открывает CSV-файл, прозрачно распаковывая .csv.gz и .csv.bz2."""
+    path = Path(path)
+    opener = OPENERS.get(path.suffix, open)
+    return opener(path, f'{mode}t', encoding='utf-8', newline='')
+
+
+def strip_compression(name):
+    """
+    Возвращает имя файла без суффикса сжатия:
+    titles.csv.gz -> titles.csv.
+    """
+    path = Path(name)
+    if path.suffix in OPENERS:
+        return path.stem
+    return path.name
+
+
+def open_binary(path):
+    """Открывает CSV-файл в двоичном режиме с распаковкой."""
+    path = Path(path)
+    return OPENERS.get(path.suffix, open)(path, 'rb')
+
+
+def get_data_size(path):
+    """
+    Возвращает размер данных файла в байтах.
+    Для сжатых файлов размер распакованных данных неизвестен: None.
+    """
+    path = Path(path)
+    if path.suffix in OPENERS:
+        return None
+    return path.stat().st_size
+
+
+class CountingLines:
+    """Итератор строк двоичного файла, считающий прочитанные байты."""
+
+    def __init__(self, binary_file):
+        self.file = binary_file
+        self.offset = 0
+
+    def __iter__(self):
+        for line in self.file:
+            self.offset += len(line)
+            yield line.decode('utf-8')
+
+    def seek(self, offset):
+        """Переходит к смещению offset от начала распакованных данных."""
+        self.file.seek(offset)
+        self.offset = offset
+
+
+def read_rows(path, offset=0):
+    """
+    Построчно читает CSV через csv.reader.
+    Возвращает пары (смещение в байтах после строки, словарь строки).
+    Заголовок всегда читается из начала файла, затем чтение
+    продолжается со смещения offset.
+    """
+    with open_binary(path) as binary_file:
+        lines = CountingLines(binary_file)
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            return
+        if offset:
+            lines.seek(offset)
+        for row in reader:
+            yield lines.offset, dict(zip(header, row))
+
+
+def iter_batches(iterable, size):
+    """Разбивает поток на списки длиной не более size."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def find_table_files(tables, data_dir, paths=()):
+    """
+    Сопоставляет моделям файлы для загрузки.
+    Явно переданные пути сопоставляются по имени файла из tables,
+    иначе файл ищется в data_dir, в том числе в сжатом виде.
+    """
+    models_by_name = {name: model for model, name in tables.items()}
+    if paths:
+        files = {}
+        for path in map(Path, paths):
+            model = models_by_name.get(strip_compression(path.name))
+            if model is None:
+                raise ValueError(f'Неизвестный файл данных: {path.name}')
+            files[model] = path
+        return files
+    files = {}
+    for model, name in tables.items():
+        for suffix in ('', *OPENERS):
+            path = Path(data_dir) / f'{name}{suffix}'
+            if path.exists():
+                files[model] = path
+                break
+    return files
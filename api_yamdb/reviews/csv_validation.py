@@ -0,0 +1,371 @@
+import csv
+from collections import defaultdict
+
+import numpy as np
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import (
+    MaxLengthValidator,
+    MaxValueValidator,
+    MinValueValidator
+)
+from django.db import models
+from django.utils.timezone import now
+from rest_framework.exceptions import ValidationError
+
+from reviews.csv_utils import iter_batches, open_csv
+from reviews.query_utils import filter_in_chunks
+from reviews.validators import year_validator
+
+VALIDATION_CHUNK_SIZE = 100000
+
+INT64_MAX = str(np.iinfo(np.int64).max)
+
+VECTOR_CHECKS = (
+    (year_validator, lambda values: values > now().year),
+)
+
+
+def get_message(validator, value):
+    """
+    Возвращает текст ошибки валидатора для значения
+    или None, если значение допустимо.
+    """
+    try:
+        validator(value)
+    except ValidationError as e:
+        return ' '.join(map(str, e.detail))
+    except DjangoValidationError as e:
+        return ' '.join(e.messages)
+    return None
+
+
+def parse_integers(column):
+    """
+    Переводит строковую колонку в int64.
+    Возвращает значения и маску строк, которые удалось разобрать.
+    Посимвольная проверка нужна, только если в колонке есть
+    не числа или числа вне диапазона int64.
+    """
+    try:
+        return column.astype(np.int64), np.ones(len(column), dtype=bool)
+    except (ValueError, OverflowError):
+        pass
+    digits = np.char.lstrip(column, '-')
+    signs = np.char.str_len(column) - np.char.str_len(digits)
+    parsed = (
+        np.char.isdecimal(digits) & (np.char.str_len(digits) > 0)
+        & (signs <= 1)
+    )
+    significant = np.char.lstrip(digits, '0')
+    lengths = np.char.str_len(significant)
+    parsed &= (lengths < len(INT64_MAX)) | (
+        (lengths == len(INT64_MAX)) & (significant <= INT64_MAX)
+    )
+    return np.where(parsed, column, '0').astype(np.int64), parsed
+
+
+def find_duplicates(keys):
+    """
+    Возвращает для каждого ключа индекс его первого вхождения.
+    keys — одномерный массив или двумерный массив составных ключей.
+    """
+    _, first, inverse = np.unique(
+        keys, axis=0 if keys.ndim > 1 else None,
+        return_index=True, return_inverse=True,
+    )
+    return first[inverse.reshape(-1)]
+
+
+class TableValidator:
+    """
+    Проверяет CSV-файл модели целыми колонками до загрузки.
+
+    Файл читается кусками по VALIDATION_CHUNK_SIZE строк. Для каждого
+    куска числовые колонки разбираются в массивы NumPy, а диапазоны,
+    year_validator, длина строк и допустимые значения choices
+    проверяются векторно. Остальные валидаторы полей, например
+    username_validator, вызываются один раз на уникальное значение
+    колонки. Уникальность первичного ключа, полей unique, unique_together
+    и UniqueConstraint проверяется по всему файлу, а остальных ключей
+    еще и по строкам базы данных с другим первичным ключом. Ссылки
+    проверяются по идентификаторам уже проверенных файлов и по базе
+    данных.
+    """
+
+    def __init__(self, model, known_ids, chunk_size=VALIDATION_CHUNK_SIZE):
+        self.model = model
+        self.known_ids = known_ids
+        self.chunk_size = chunk_size
+        self.fields = [
+            field for field in model._meta.concrete_fields
+            if not getattr(field, 'auto_now_add', False)
+        ]
+        self.unique_sets = [
+            [model._meta.get_field(name) for name in names]
+            for names in self.get_unique_sets()
+        ]
+        self.keys = defaultdict(list)
+        self.row_ids = []
+        self.references = defaultdict(list)
+        self.violations = []
+
+    def get_unique_sets(self):
+        """Возвращает наборы полей, значения которых уникальны."""
+        meta = self.model._meta
+        yield from (
+            (field.name,) for field in meta.concrete_fields if field.unique
+        )
+        yield from meta.unique_together
+        yield from (
+            constraint.fields for constraint in meta.constraints
+            if isinstance(constraint, models.UniqueConstraint)
+            and constraint.fields and constraint.condition is None
+        )
+
+    def add(self, rows, field, message):
+        """Запоминает нарушения для номеров строк rows."""
+        if field is not None:
+            name = field if isinstance(field, str) else field.name
+            message = f'{name}: {message}'
+        self.violations.extend((int(row), message) for row in rows)
+
+    def validate(self, path):
+        """
+        Проверяет файл.
+        Возвращает отсортированные пары (номер строки, нарушение)
+        и идентификаторы строк с корректным первичным ключом.
+        """
+        with open_csv(path) as csv_file:
+            reader = csv.reader(csv_file)
+            header = next(reader, None) or []
+            first_row = 1
+            for chunk in iter_batches(reader, self.chunk_size):
+                self.validate_chunk(header, chunk, first_row)
+                first_row += len(chunk)
+        ids = self.check_unique()
+        self.check_references()
+        self.violations.sort()
+        return self.violations, ids
+
+    def get_columns(self, header, chunk, rows):
+        """Раскладывает строки куска по колонкам полей модели."""
+        width = len(header)
+        widths = np.fromiter(map(len, chunk), dtype=np.int64, count=len(chunk))
+        for row, row_width in zip(rows[widths != width],
+                                  widths[widths != width]):
+            self.add(
+                (row,), None,
+                f'ожидалось колонок: {width}, получено: {row_width}.',
+            )
+        chunk = [
+            (row + [''] * width)[:width] if len(row) != width else row
+            for row in chunk
+        ]
+        columns = dict(zip(header, (
+            np.array(column, dtype=str) for column in zip(*chunk)
+        )))
+        return {
+            field: columns[
+                field.name if field.name in columns else field.attname
+            ]
+            for field in self.fields
+            if field.name in columns or field.attname in columns
+        }
+
+    def validate_chunk(self, header, chunk, first_row):
+        """Проверяет кусок строк файла."""
+        rows = np.arange(first_row, first_row + len(chunk))
+        columns = self.get_columns(header, chunk, rows)
+        values, valid = {}, {}
+        for field, column in columns.items():
+            values[field], valid[field] = self.check_field(
+                field, column, rows
+            )
+        for field_set in self.unique_sets:
+            if not all(field in values for field in field_set):
+                continue
+            mask = np.logical_and.reduce([valid[f] for f in field_set])
+            # Строки хранятся объектами Python, а не массивами
+            # фиксированной ширины по самому длинному значению.
+            key = [
+                values[field][mask].astype(
+                    object if values[field].dtype.kind == 'U' else np.int64
+                )
+                for field in field_set
+            ]
+            self.keys[tuple(field_set)].append((rows[mask], key))
+        pk = self.model._meta.pk
+        if pk in values:
+            self.row_ids.append((rows[valid[pk]], values[pk][valid[pk]]))
+        for field in columns:
+            if field.is_relation:
+                mask = valid[field]
+                self.references[field].append(
+                    (rows[mask], values[field][mask])
+                )
+
+    def check_field(self, field, column, rows):
+        """
+        Проверяет колонку поля.
+        Возвращает значения и маску строк, прошедших проверки.
+        """
+        empty = column == ''
+        valid = ~empty
+        if not (field.blank or field.null):
+            self.add(rows[empty], field, 'обязательное поле.')
+        if field.is_relation or isinstance(field, models.IntegerField):
+            values, parsed = parse_integers(column)
+            self.add(rows[~parsed & ~empty], field, 'ожидается целое число.')
+            valid &= parsed
+        else:
+            values = column
+        if field.choices:
+            bad = valid & ~np.isin(
+                column, [str(choice) for choice, _ in field.flatchoices]
+            )
+            self.add(rows[bad], field, 'недопустимое значение.')
+            valid &= ~bad
+        for validator in field.validators:
+            bad = self.check_validator(validator, values, valid)
+            for row, value in zip(rows[bad], values[bad]):
+                message = get_message(validator, value.item())
+                self.add((row,), field, f'{message} Значение: {value}')
+            valid &= ~bad
+        return values, valid
+
+    def check_validator(self, validator, values, valid):
+        """Возвращает маску строк, не прошедших валидатор."""
+        for function, check in VECTOR_CHECKS:
+            if validator is function:
+                return valid & check(values)
+        if isinstance(validator, MinValueValidator):
+            return valid & (values < validator.limit_value)
+        if isinstance(validator, MaxValueValidator):
+            return valid & (values > validator.limit_value)
+        if isinstance(validator, MaxLengthValidator):
+            return valid & (np.char.str_len(values) > validator.limit_value)
+        unique, inverse = np.unique(values[valid], return_inverse=True)
+        failed = np.array(
+            [get_message(validator, value.item()) is not None
+             for value in unique],
+            dtype=bool,
+        )
+        bad = np.zeros(len(values), dtype=bool)
+        bad[valid] = failed[inverse] if len(unique) else False
+        return bad
+
+    def check_unique(self):
+        """
+        Проверяет уникальность ключей по всему файлу.
+        Возвращает идентификаторы строк с корректным первичным ключом.
+        """
+        ids = np.array([], dtype=np.int64)
+        for field_set, parts in self.keys.items():
+            rows = np.concatenate([part_rows for part_rows, _ in parts])
+            columns = [
+                np.concatenate([key[index] for _, key in parts])
+                for index in range(len(field_set))
+            ]
+            if field_set == (self.model._meta.pk,):
+                ids = np.unique(columns[0])
+            if not len(rows):
+                continue
+            if len(columns) == 1:
+                keys = columns[0]
+            elif all(column.dtype != object for column in columns):
+                keys = np.column_stack(columns)
+            else:
+                keys = np.array(
+                    ['\x00'.join(map(str, key)) for key in zip(*columns)],
+                    dtype=object,
+                )
+            first = find_duplicates(keys)
+            duplicates = np.flatnonzero(first != np.arange(len(rows)))
+            name = ', '.join(field.name for field in field_set)
+            for index in duplicates:
+                self.add(
+                    (rows[index],), name,
+                    f'повторяет строку {rows[first[index]]}.',
+                )
+            if field_set != (self.model._meta.pk,):
+                self.check_existing(field_set, rows, columns)
+        return ids
+
+    def get_row_ids(self, rows):
+        """
+        Возвращает первичные ключи строк rows из файла
+        и маску строк, у которых он есть.
+        """
+        if not self.row_ids:
+            return np.zeros(len(rows), dtype=np.int64), np.zeros(
+                len(rows), dtype=bool
+            )
+        id_rows = np.concatenate([part_rows for part_rows, _ in self.row_ids])
+        ids = np.concatenate([part_ids for _, part_ids in self.row_ids])
+        index = np.minimum(np.searchsorted(id_rows, rows), len(id_rows) - 1)
+        return ids[index], id_rows[index] == rows
+
+    def check_existing(self, field_set, rows, columns):
+        """
+        Проверяет, что ключей нет в базе данных у строк с другим
+        первичным ключом: строку с тем же ключом загрузка обновит.
+        """
+        names = [field.attname for field in field_set]
+        keys = list(zip(*(column.tolist() for column in columns)))
+        existing = {}
+        for *key, pk in filter_in_chunks(
+            self.model.objects, names[0],
+            list({values[0] for values in keys}), *names, 'pk',
+        ):
+            existing[tuple(key)] = pk
+        if not existing:
+            return
+        ids, has_id = self.get_row_ids(rows)
+        name = ', '.join(field.name for field in field_set)
+        for row, key, row_id, known in zip(rows, keys, ids, has_id):
+            pk = existing.get(key)
+            if pk is not None and not (known and row_id == pk):
+                self.add(
+                    (row,), name,
+                    f'уже есть в базе у объекта {self.model.__name__} '
+                    f'с id {pk}.',
+                )
+
+    def check_references(self):
+        """
+        Проверяет, что связанные объекты есть в проверенных файлах
+        или в базе данных.
+        """
+        for field, parts in self.references.items():
+            rows = np.concatenate([part_rows for part_rows, _ in parts])
+            values = np.concatenate([part_values for _, part_values in parts])
+            known = self.known_ids.get(field.related_model)
+            missing = ~np.isin(values, known) if known is not None else (
+                np.ones(len(values), dtype=bool)
+            )
+            unknown = np.unique(values[missing]).tolist()
+            if unknown:
+                in_db = np.fromiter(filter_in_chunks(
+                    field.related_model.objects, 'pk', unknown, 'pk'
+                ), dtype=np.int64)
+                missing &= ~np.isin(values, in_db)
+            for row, value in zip(rows[missing], values[missing]):
+                self.add(
+                    (row,), field,
+                    f'нет объекта {field.related_model.__name__} '
+                    f'с id {value}.',
+                )
+
+
+def validate_files(files, stages, chunk_size=VALIDATION_CHUNK_SIZE):
+    """
+    Проверяет файлы по этапам загрузки.
+    Возвращает словарь {модель: [(номер строки, нарушение), ...]}.
+    """
+    known_ids, violations = {}, {}
+    for stage in stages:
+        for model in stage:
+            violations[model], known_ids[model] = TableValidator(
+                model, known_ids, chunk_size
+            ).validate(files[model])
+    return violations
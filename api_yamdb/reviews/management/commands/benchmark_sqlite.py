@@ -0,0 +1,143 @@
+import random
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api_yamdb.consts import SCORE_MAX, SCORE_MIN
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'DELETE',
+}
+
+TITLES = 1000
+
+ROWS = 10000
+
+
+class Command(BaseCommand):
+    """
+    Сравнение пропускной способности SQLite со стандартными
+    настройками и с SQLITE_PRAGMAS при конкурентной нагрузке.
+
+    Во временной базе создается таблица, похожая на отзывы. Читатели
+    считают средние оценки произведений, писатели проверяют, нет ли
+    отзыва автора, и добавляют новый в режиме автокоммита, как при
+    POST-запросе отзыва. Для каждого набора настроек выводятся
+    чтения и записи в секунду и число ошибок "database is locked".
+
+    Использование:
+    python manage.py benchmark_sqlite [--readers 4] [--writers 4]
+    [--seconds 5]
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--seconds', type=float, default=5)
+
+    def handle(self, *args, **kwargs):
+        """Метод обработки для команды управления."""
+        for name, pragmas in (
+            ('стандартные настройки', DEFAULT_PRAGMAS),
+            ('SQLITE_PRAGMAS', settings.SQLITE_PRAGMAS),
+        ):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                path = Path(tmp_dir) / 'benchmark.sqlite3'
+                self.create_database(path)
+                counts = self.run(path, pragmas, kwargs)
+            seconds = kwargs['seconds']
+            self.stdout.write(self.style.SUCCESS(
+                f'{name}: чтений {counts["reads"] / seconds:.0f}/с, '
+                f'записей {counts["writes"] / seconds:.0f}/с, '
+                f'ошибок блокировки {counts["locked"]}'))
+
+    def connect(self, path, pragmas):
+        """Открывает соединение так же, как бэкенд SQLite в Django."""
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.isolation_level = None
+        for pragma, value in pragmas.items():
+            db.execute(f'PRAGMA {pragma} = {value}')
+        return db
+
+    def create_database(self, path):
+        """Создает таблицу отзывов с начальными данными."""
+        db = sqlite3.connect(path)
+        db.execute(
+            'CREATE TABLE review (id INTEGER PRIMARY KEY, title_id INTEGER, '
+            'author_id INTEGER, score INTEGER, text TEXT)'
+        )
+        db.execute('CREATE INDEX review_title ON review (title_id)')
+        db.executemany(
+            'INSERT INTO review (title_id, author_id, score, text) '
+            'VALUES (?, ?, ?, ?)',
+            (
+                (random.randrange(TITLES), author,
+                 random.randint(SCORE_MIN, SCORE_MAX), 'Отзыв')
+                for author in range(ROWS)
+            ),
+        )
+        db.commit()
+        db.close()
+
+    def run(self, path, pragmas, options):
+        """Запускает читателей и писателей и возвращает счетчики."""
+        deadline = time.monotonic() + options['seconds']
+        workers = (
+            [self.read] * options['readers']
+            + [self.write] * options['writers']
+        )
+        with ThreadPoolExecutor(max(len(workers), 1)) as pool:
+            futures = [
+                pool.submit(worker, path, pragmas, deadline)
+                for worker in workers
+            ]
+        return sum((future.result() for future in futures), Counter())
+
+    def read(self, path, pragmas, deadline):
+        """Читает средние оценки произведений до deadline."""
+        counts = Counter()
+        db = self.connect(path, pragmas)
+        while time.monotonic() < deadline:
+            try:
+                db.execute(
+                    'SELECT COUNT(*), AVG(score) FROM review '
+                    'WHERE title_id = ?', (random.randrange(TITLES),)
+                ).fetchone()
+            except sqlite3.OperationalError:
+                counts['locked'] += 1
+            else:
+                counts['reads'] += 1
+        db.close()
+        return counts
+
+    def write(self, path, pragmas, deadline):
+        """Добавляет отзывы до deadline, как POST-запрос отзыва."""
+        counts = Counter()
+        db = self.connect(path, pragmas)
+        author = ROWS
+        while time.monotonic() < deadline:
+            author += 1
+            title_id = random.randrange(TITLES)
+            try:
+                db.execute(
+                    'SELECT 1 FROM review '
+                    'WHERE title_id = ? AND author_id = ?',
+                    (title_id, author),
+                ).fetchone()
+                db.execute(
+                    'INSERT INTO review (title_id, author_id, score, '
+                    'text) VALUES (?, ?, ?, ?)',
+                    (title_id, author, SCORE_MAX, 'Отзыв'),
+                )
+            except sqlite3.OperationalError:
+                counts['locked'] += 1
+            else:
+                counts['writes'] += 1
+        db.close()
+        return counts
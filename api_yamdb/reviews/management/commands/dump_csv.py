@@ -0,0 +1,164 @@
+import csv
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from reviews.csv_utils import open_csv
+from reviews.management.commands.load_csv import TABLES
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+COLUMNS = {
+    User: (
+        ('id', 'id'),
+        ('username', 'username'),
+        ('email', 'email'),
+        ('role', 'role'),
+        ('bio', 'bio'),
+        ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+    ),
+    Title: (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('year', 'year'),
+        ('category', 'category_id'),
+        ('description', 'description'),
+    ),
+    Genre: (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('slug', 'slug'),
+    ),
+    Category: (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('slug', 'slug'),
+    ),
+    Review: (
+        ('id', 'id'),
+        ('title_id', 'title_id'),
+        ('text', 'text'),
+        ('author', 'author_id'),
+        ('score', 'score'),
+        ('pub_date', 'pub_date'),
+    ),
+    Comment: (
+        ('id', 'id'),
+        ('review_id', 'review_id'),
+        ('text', 'text'),
+        ('author', 'author_id'),
+        ('pub_date', 'pub_date'),
+    ),
+    Title.genre.through: (
+        ('id', 'id'),
+        ('title_id', 'title_id'),
+        ('genre_id', 'genre_id'),
+    ),
+}
+
+CHUNK_SIZE = 2000
+
+WORKERS = 4
+
+
+class Command(BaseCommand):
+    """
+    Выгрузка данных в CSV-файлы в формате команды load_csv.
+
+    Таблицы из TABLES читаются потоково через values_list().iterator()
+    без создания объектов моделей, поэтому потребление памяти
+    не зависит от объема данных. Таблицы выгружаются параллельно
+    в пуле потоков, файлы можно сжимать в gzip. Колонки, которых нет
+    в исходных файлах, например описание произведения, выгружаются
+    после колонок исходного формата.
+
+    Использование:
+    python manage.py dump_csv [files ...] [--output-dir .] [--gzip]
+    [--chunk-size 2000] [--workers 4]
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'files',
+            nargs='*',
+            help='Файлы для выгрузки, например titles.csv. По умолчанию все.',
+        )
+        parser.add_argument(
+            '--output-dir',
+            default='.',
+            help='Каталог для CSV-файлов.',
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжимать файлы в .csv.gz.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за раз.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=WORKERS,
+            help='Количество потоков для выгрузки таблиц.',
+        )
+
+    def handle(self, *args, **kwargs):
+        """Метод обработки для команды управления."""
+        models_by_name = {name: model for model, name in TABLES.items()}
+        unknown = set(kwargs['files']) - set(models_by_name)
+        if unknown:
+            raise CommandError(
+                'Неизвестные файлы: ' + ', '.join(sorted(unknown)))
+        models = [
+            models_by_name[name] for name in kwargs['files']
+        ] or list(TABLES)
+        output_dir = Path(kwargs['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        suffix = '.gz' if kwargs['gzip'] else ''
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=kwargs['workers']) as executor:
+            for future in [
+                executor.submit(
+                    self.export_table,
+                    model,
+                    output_dir / f'{TABLES[model]}{suffix}',
+                    kwargs['chunk_size'],
+                )
+                for model in models
+            ]:
+                future.result()
+        self.stdout.write(self.style.SUCCESS(
+            f'Все данные выгружены за {time.monotonic() - started:.2f} с'))
+
+    def export_table(self, model, path, chunk_size):
+        """Выгружает одну таблицу в отдельном потоке."""
+        try:
+            self.dump_table(model, path, chunk_size)
+        finally:
+            connection.close()
+
+    def dump_table(self, model, path, chunk_size=CHUNK_SIZE):
+        """Выгружает таблицу в CSV-файл."""
+        started = time.monotonic()
+        headers, fields = zip(*COLUMNS[model])
+        rows = model.objects.order_by('pk').values_list(*fields).iterator(
+            chunk_size=chunk_size
+        )
+        count = 0
+        with open_csv(path, 'w') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(headers)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'{model.__name__}: выгружено {count} строк в {path} '
+            f'за {time.monotonic() - started:.2f} с'))
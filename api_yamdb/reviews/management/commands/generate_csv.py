@@ -0,0 +1,306 @@
+import csv
+import time
+from pathlib import Path
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import now
+
+from api_yamdb.consts import SCORE_MAX, SCORE_MIN
+from reviews.csv_utils import open_csv
+from reviews.management.commands.dump_csv import COLUMNS
+from reviews.management.commands.load_csv import TABLES
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+CHUNK_SIZE = 100000
+
+FIRST_YEAR = 1900
+
+PUB_DATE_START = np.datetime64('2015-01-01T00:00:00', 's')
+
+PUB_DATE_SPAN = 10 * 365 * 24 * 60 * 60
+
+MAX_GENRES_PER_TITLE = 3
+
+SCORE_WEIGHTS = np.array((1, 1, 2, 3, 5, 8, 12, 16, 14, 10), dtype=float)
+
+
+class Command(BaseCommand):
+    """
+    Генерация синтетического набора данных в формате load_csv.
+
+    Данные воспроизводимы: одинаковые --seed и размеры дают одинаковые
+    файлы. Количество отзывов на произведение распределено по закону
+    Ципфа с показателем --zipf, поэтому у небольшого числа популярных
+    произведений тысячи отзывов, а у большинства единицы. Один автор
+    оставляет не больше одного отзыва на произведение. Строки считаются
+    векторно в NumPy и пишутся кусками по --chunk-size.
+
+    Использование:
+    python manage.py generate_csv --output-dir /data/synthetic
+    --titles 1000000 --reviews 50000000 [--seed 42] [--gzip]
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir',
+            required=True,
+            help='Каталог для CSV-файлов.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Начальное значение генератора случайных чисел '
+                 '(по умолчанию 0).',
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=10000,
+            help='Количество пользователей (по умолчанию 10000).',
+        )
+        parser.add_argument(
+            '--categories',
+            type=int,
+            default=3,
+            help='Количество категорий (по умолчанию 3).',
+        )
+        parser.add_argument(
+            '--genres',
+            type=int,
+            default=15,
+            help='Количество жанров (по умолчанию 15).',
+        )
+        parser.add_argument(
+            '--titles',
+            type=int,
+            default=10000,
+            help='Количество произведений (по умолчанию 10000).',
+        )
+        parser.add_argument(
+            '--reviews',
+            type=int,
+            default=100000,
+            help='Количество отзывов (по умолчанию 100000). Отзывов '
+                 'на произведение не больше, чем пользователей, поэтому '
+                 'их может получиться меньше.',
+        )
+        parser.add_argument(
+            '--comments',
+            type=int,
+            default=100000,
+            help='Количество комментариев (по умолчанию 100000).',
+        )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Показатель s распределения Ципфа отзывов по '
+                 'произведениям: вес произведения ранга k равен 1 / k^s '
+                 '(по умолчанию 1.1). Чем больше показатель, тем больше '
+                 'отзывов у самых популярных произведений.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество строк, записываемых за раз '
+                 f'(по умолчанию {CHUNK_SIZE}).',
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжимать файлы в .csv.gz.',
+        )
+
+    def handle(self, *args, **kwargs):
+        """Метод обработки для команды управления."""
+        for option in ('users', 'categories', 'genres', 'titles'):
+            if kwargs[option] < 1:
+                raise CommandError(f'--{option} должно быть больше нуля')
+        self.rng = np.random.default_rng(kwargs['seed'])
+        self.options = kwargs
+        self.output_dir = Path(kwargs['output_dir'])
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        started = time.monotonic()
+        self.write(User, self.generate_users())
+        self.write(Category, self.generate_names(
+            kwargs['categories'], 'Категория', 'category'))
+        self.write(Genre, self.generate_names(
+            kwargs['genres'], 'Жанр', 'genre'))
+        self.write(Title, self.generate_titles())
+        self.write(Title.genre.through, self.generate_genre_titles())
+        self.write(Review, self.generate_reviews())
+        self.write(Comment, self.generate_comments())
+        self.stdout.write(self.style.SUCCESS(
+            f'Данные сгенерированы за {time.monotonic() - started:.2f} с'))
+
+    def write(self, model, chunks):
+        """Записывает куски колонок в CSV-файл модели."""
+        suffix = '.gz' if self.options['gzip'] else ''
+        path = self.output_dir / f'{TABLES[model]}{suffix}'
+        count = 0
+        with open_csv(path, 'w') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(header for header, _ in COLUMNS[model])
+            for columns in chunks:
+                writer.writerows(zip(*(
+                    column.tolist() for column in columns
+                )))
+                count += len(columns[0])
+        self.stdout.write(self.style.SUCCESS(
+            f'{model.__name__}: {count} строк в {path}'))
+
+    def id_chunks(self, total):
+        """Разбивает идентификаторы 1..total на куски."""
+        chunk_size = self.options['chunk_size']
+        for start in range(1, total + 1, chunk_size):
+            yield np.arange(start, min(start + chunk_size, total + 1))
+
+    def pub_dates(self, size):
+        """Возвращает случайные даты публикации в формате ISO 8601."""
+        seconds = self.rng.integers(0, PUB_DATE_SPAN, size)
+        return np.char.add(np.datetime_as_string(
+            PUB_DATE_START + seconds.astype('timedelta64[s]'), unit='ms'
+        ), 'Z')
+
+    def generate_users(self):
+        """Генерирует пользователей."""
+        roles = np.array(User.Role.values)
+        for ids in self.id_chunks(self.options['users']):
+            usernames = np.char.add('user', ids.astype(str))
+            empty = np.full(len(ids), '')
+            yield (
+                ids,
+                usernames,
+                np.char.add(usernames, '@yamdb.fake'),
+                roles[self.rng.choice(
+                    len(roles), len(ids), p=(0.98, 0.005, 0.015)
+                )],
+                empty,
+                empty,
+                empty,
+            )
+
+    def generate_names(self, total, name, slug):
+        """Генерирует категории или жанры."""
+        for ids in self.id_chunks(total):
+            yield (
+                ids,
+                np.char.add(f'{name} ', ids.astype(str)),
+                np.char.add(f'{slug}-', ids.astype(str)),
+            )
+
+    def generate_titles(self):
+        """Генерирует произведения."""
+        for ids in self.id_chunks(self.options['titles']):
+            yield (
+                ids,
+                np.char.add('Произведение ', ids.astype(str)),
+                self.rng.integers(FIRST_YEAR, now().year + 1, len(ids)),
+                self.rng.integers(
+                    1, self.options['categories'] + 1, len(ids)
+                ),
+            )
+
+    def distinct_values(self, owner_ids, counts, permutation):
+        """
+        Для каждого владельца выбирает counts различных значений:
+        подряд идущие элементы перестановки permutation, начиная
+        со случайной позиции.
+        """
+        total = len(permutation)
+        starts = self.rng.integers(0, total, len(owner_ids))
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        positions = (np.repeat(starts, counts) + offsets) % total
+        return np.repeat(owner_ids, counts), permutation[positions]
+
+    def generate_genre_titles(self):
+        """Генерирует связи произведений и жанров."""
+        genres = self.options['genres']
+        permutation = self.rng.permutation(genres) + 1
+        next_id = 1
+        for title_ids in self.id_chunks(self.options['titles']):
+            counts = self.rng.integers(
+                1, min(MAX_GENRES_PER_TITLE, genres) + 1, len(title_ids)
+            )
+            title_column, genre_column = self.distinct_values(
+                title_ids, counts, permutation
+            )
+            ids = np.arange(next_id, next_id + len(title_column))
+            next_id += len(ids)
+            yield ids, title_column, genre_column
+
+    def review_counts(self):
+        """
+        Распределяет отзывы по произведениям по закону Ципфа.
+        Число отзывов на произведение ограничено числом пользователей.
+        """
+        titles = self.options['titles']
+        weights = 1 / np.arange(1, titles + 1) ** self.options['zipf']
+        self.rng.shuffle(weights)
+        counts = self.rng.multinomial(
+            self.options['reviews'], weights / weights.sum()
+        )
+        return np.minimum(counts, self.options['users'])
+
+    def review_title_chunks(self, counts):
+        """
+        Разбивает произведения на куски примерно по --chunk-size отзывов.
+        """
+        chunk_size = self.options['chunk_size']
+        cumulative = np.cumsum(counts)
+        edges = np.searchsorted(
+            cumulative,
+            np.arange(chunk_size, self.review_total, chunk_size),
+        ) + 1
+        edges = np.unique(np.concatenate(([0], edges, [len(counts)])))
+        for start, end in zip(edges[:-1], edges[1:]):
+            yield np.arange(start + 1, end + 1)
+
+    def generate_reviews(self):
+        """Генерирует отзывы."""
+        counts = self.review_counts()
+        self.review_total = int(counts.sum())
+        if self.review_total < self.options['reviews']:
+            self.stdout.write(self.style.WARNING(
+                f'Отзывов будет {self.review_total} вместо '
+                f'{self.options["reviews"]}: на произведение не может быть '
+                'больше отзывов, чем пользователей'))
+        permutation = self.rng.permutation(self.options['users']) + 1
+        score_weights = SCORE_WEIGHTS / SCORE_WEIGHTS.sum()
+        next_id = 1
+        for title_ids in self.review_title_chunks(counts):
+            title_column, authors = self.distinct_values(
+                title_ids, counts[title_ids - 1], permutation
+            )
+            ids = np.arange(next_id, next_id + len(title_column))
+            next_id += len(ids)
+            yield (
+                ids,
+                title_column,
+                np.char.add('Отзыв ', ids.astype(str)),
+                authors,
+                self.rng.choice(
+                    np.arange(SCORE_MIN, SCORE_MAX + 1), len(ids),
+                    p=score_weights,
+                ),
+                self.pub_dates(len(ids)),
+            )
+
+    def generate_comments(self):
+        """Генерирует комментарии к случайным отзывам."""
+        if not self.review_total:
+            return
+        for ids in self.id_chunks(self.options['comments']):
+            yield (
+                ids,
+                self.rng.integers(1, self.review_total + 1, len(ids)),
+                np.char.add('Комментарий ', ids.astype(str)),
+                self.rng.integers(1, self.options['users'] + 1, len(ids)),
+                self.pub_dates(len(ids)),
+            )
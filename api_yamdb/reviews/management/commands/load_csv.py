@@ -1,11 +1,36 @@
-import csv
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
-from django.db import IntegrityError
-from django.utils.text import slugify
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection, models, transaction
 
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.csv_utils import (
+    find_table_files,
+    get_data_size,
+    iter_batches,
+    read_rows
+)
+from reviews.csv_validation import validate_files
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    ImportCheckpoint,
+    ImportRowChecksum,
+    Review,
+    Title
+)
+from reviews.progress import PROGRESS_INTERVAL, TableProgress
+from reviews.query_utils import filter_in_chunks, get_in_chunk_size
+from reviews.signals import data_changed
+from reviews.sqlite_bulk import sqlite_bulk_load
 from users.models import User
 
 TABLES = {
@@ -18,6 +43,115 @@ TABLES = {
     Title.genre.through: 'genre_title.csv',
 }
 
+BATCH_SIZE = 1000
+
+WORKERS = 4
+
+MISSING_IDS_SHOWN = 10
+
+KNOWN_IDS_LIMIT = 100000
+
+
+def get_checksum(data):
+    """Возвращает контрольную сумму содержимого строки CSV."""
+    return hashlib.md5(
+        json.dumps(data, sort_keys=True, ensure_ascii=False).encode()
+    ).hexdigest()
+
+
+def get_dependencies(model, models_set):
+    """Возвращает модели из models_set, на которые ссылается model."""
+    return {
+        field.related_model for field in model._meta.concrete_fields
+        if isinstance(field, models.ForeignKey)
+        and field.related_model in models_set
+        and field.related_model is not model
+    }
+
+
+def build_stages(tables):
+    """
+    Разбивает модели на этапы загрузки по графу внешних ключей.
+    Модели одного этапа не зависят друг от друга, а все модели,
+    на которые они ссылаются, загружены на предыдущих этапах.
+    """
+    pending = {model: get_dependencies(model, tables) for model in tables}
+    stages = []
+    while pending:
+        stage = [model for model, deps in pending.items() if not deps]
+        if not stage:
+            raise CommandError(
+                'Циклическая зависимость между моделями: '
+                + ', '.join(model.__name__ for model in pending)
+            )
+        stages.append(stage)
+        for model in stage:
+            del pending[model]
+        for deps in pending.values():
+            deps.difference_update(stage)
+    return stages
+
+
+class ReferenceResolver:
+    """
+    Проверяет внешние ключи строк CSV пачками.
+    Для каждой пачки собирает идентификаторы связанных объектов и
+    проверяет их одним запросом IN на модель. Найденные идентификаторы
+    запоминаются, поэтому повторно не запрашиваются; чтобы память
+    не росла с размером файла, кеш сбрасывается после KNOWN_IDS_LIMIT
+    записей. Строки с отсутствующими ссылками отбрасываются и
+    учитываются в missing_rows, примеры идентификаторов в missing_ids.
+    """
+
+    def __init__(self, model):
+        self.fields = [
+            field for field in model._meta.concrete_fields
+            if isinstance(field, models.ForeignKey)
+        ]
+        self.known = defaultdict(set)
+        self.missing_rows = Counter()
+        self.missing_ids = defaultdict(set)
+
+    def resolve(self, rows):
+        """Возвращает строки пачки, все ссылки которых существуют."""
+        for field in self.fields:
+            self.rename_column(field, rows)
+            self.fetch_known(field, {
+                data[field.attname] for _, data in rows
+                if data[field.attname] is not None
+            })
+        resolved = []
+        for row_number, data in rows:
+            missing_fields = [
+                field for field in self.fields
+                if data[field.attname] not in self.known[field.related_model]
+            ]
+            for field in missing_fields:
+                self.missing_rows[field.name] += 1
+                if len(self.missing_ids[field.name]) < MISSING_IDS_SHOWN:
+                    self.missing_ids[field.name].add(data[field.attname])
+            if not missing_fields:
+                resolved.append((row_number, data))
+        return resolved
+
+    def rename_column(self, field, rows):
+        """Приводит колонку author или author_id к виду author_id=int."""
+        for _, data in rows:
+            value = data.pop(field.name, None) or data.get(field.attname)
+            data[field.attname] = int(value) if value else None
+
+    def fetch_known(self, field, ids):
+        """Загружает существующие идентификаторы одним запросом IN."""
+        related_model = field.related_model
+        known = self.known[related_model]
+        unknown = ids - known
+        if len(known) + len(unknown) > KNOWN_IDS_LIMIT:
+            known.clear()
+            unknown = ids
+        known.update(
+            filter_in_chunks(related_model.objects, 'pk', unknown, 'pk')
+        )
+
 
 class Command(BaseCommand):
     """
@@ -26,51 +160,498 @@ class Command(BaseCommand):
 
     Эта команда перебирает словарь моделей и путей к файлам CSV,
     загружая данные из каждого CSV-файла в соответствующую модель Django.
+    Порядок загрузки определяется графом внешних ключей: независимые
+    таблицы одного этапа загружаются параллельно в пуле потоков.
+
+    Строки сохраняются пачками через bulk_create, каждая пачка в своей
+    транзакции. Если пачка не сохранилась, ее строки сохраняются по одной,
+    чтобы сообщить об ошибке в конкретной строке.
+
+    Файлы читаются потоково пачками по --batch-size строк, поэтому
+    потребление памяти не зависит от их размера. Поддерживаются сжатые
+    файлы .csv.gz и .csv.bz2. Модель определяется по имени файла.
+
+    В режиме --incremental для каждой строки считается контрольная сумма
+    и сравнивается с сохраненной в ImportRowChecksum: новые строки
+    добавляются, измененные обновляются через bulk_update, остальные
+    пропускаются. С --delete-missing удаляются строки, которых нет
+    в источнике. Первый инкрементальный запуск после полной загрузки
+    обновляет все строки, так как их контрольные суммы еще не сохранены.
+
+    После каждой пачки в той же транзакции сохраняется контрольная точка
+    ImportCheckpoint: файл, смещение в байтах и число пачек. С --resume
+    загрузка продолжается с последней контрольной точки, а полностью
+    загруженные таблицы пропускаются.
+
+    С --sqlite-bulk на время загрузки SQLite переключается в режим
+    массовой вставки: WAL, synchronous=OFF, увеличенный кеш и удаление
+    неуникальных индексов с их пересозданием и ANALYZE в конце.
+
+    Во время загрузки каждые --progress-interval секунд для таблицы
+    выводятся число строк, скорость, число пачек, ошибок и оценка
+    оставшегося времени. С --stats-json сводка по таблицам и этапам
+    записывается в JSON-файл.
+
+    С --validate-only файлы только проверяются, в базу ничего
+    не записывается: год, оценка, username, допустимые значения,
+    уникальность (в файле и по строкам базы) и ссылки на связанные
+    объекты проверяются целыми колонками, обо всех нарушениях
+    сообщается с номерами строк.
+
+    После загрузки отзывов статистика произведений пересчитывается
+    командой recompute_stats, если не указан --skip-recompute.
 
     Использование:
-    python manage.py load_csv
+    python manage.py load_csv [paths ...] [--data-dir static/data]
+    [--batch-size 1000] [--workers 4] [--incremental [--delete-missing]]
+    [--resume] [--sqlite-bulk] [--progress-interval 5]
+    [--stats-json stats.json] [--validate-only] [--skip-recompute]
     """
 
+    write_lock = nullcontext()
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='*',
+            help='Файлы для загрузки, например titles.csv.gz.',
+        )
+        parser.add_argument(
+            '--data-dir',
+            default=settings.BASE_DIR / 'static' / 'data',
+            help='Каталог с файлами данных, если они не указаны явно.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество строк в одной пачке bulk_create.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=WORKERS,
+            help='Количество потоков для загрузки независимых таблиц.',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Добавлять новые и обновлять измененные строки.',
+        )
+        parser.add_argument(
+            '--delete-missing',
+            action='store_true',
+            help='В режиме --incremental удалять строки, которых нет в CSV.',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Продолжить загрузку с последней контрольной точки.',
+        )
+        parser.add_argument(
+            '--sqlite-bulk',
+            action='store_true',
+            help='Режим массовой загрузки для SQLite.',
+        )
+        parser.add_argument(
+            '--progress-interval',
+            type=float,
+            default=PROGRESS_INTERVAL,
+            help='Интервал вывода прогресса в секундах.',
+        )
+        parser.add_argument(
+            '--stats-json',
+            help='Файл для сводки по таблицам в формате JSON.',
+        )
+        parser.add_argument(
+            '--validate-only',
+            action='store_true',
+            help='Только проверить файлы, ничего не записывая в базу.',
+        )
+        parser.add_argument(
+            '--skip-recompute',
+            action='store_true',
+            help='Не пересчитывать статистику произведений после загрузки.',
+        )
+
     def handle(self, *args, **kwargs):
         """Метод обработки для команды управления."""
-        for model, csv_f in TABLES.items():
-            csv_path = f'{settings.BASE_DIR}/static/data/{csv_f}'
+        if kwargs['delete_missing'] and not kwargs['incremental']:
+            raise CommandError(
+                '--delete-missing используется только с --incremental')
+        if kwargs['delete_missing'] and kwargs['resume']:
+            raise CommandError(
+                '--delete-missing нельзя использовать вместе с --resume')
+        if kwargs['sqlite_bulk'] and connection.vendor != 'sqlite':
+            raise CommandError('--sqlite-bulk поддерживается только SQLite')
+        try:
+            files = find_table_files(
+                TABLES, kwargs['data_dir'], kwargs['paths']
+            )
+        except ValueError as e:
+            raise CommandError(e)
+        if not files:
+            raise CommandError(
+                f'В каталоге {kwargs["data_dir"]} нет файлов для загрузки')
+        if kwargs['validate_only']:
+            self.validate(files)
+            return
+        started = time.monotonic()
+        try:
+            with self.get_bulk_load(files, kwargs):
+                stages = self.load_stages(files, kwargs)
+        finally:
+            data_changed.send(sender=self.__class__, models=tuple(files))
+        total = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Все данные загружены за {total:.2f} с'))
+        if kwargs['stats_json']:
+            self.write_stats(kwargs['stats_json'], stages, total)
+        self.recompute_stats(files, kwargs)
+
+    def get_bulk_load(self, files, options):
+        """
+        Возвращает контекст загрузки: режим массовой загрузки SQLite
+        с --sqlite-bulk, иначе пустой.
+        """
+        if not options['sqlite_bulk']:
+            return nullcontext()
+        return sqlite_bulk_load([model._meta.db_table for model in files])
+
+    def recompute_stats(self, files, options):
+        """Пересчитывает статистику произведений после загрузки отзывов."""
+        if Review in files and not options['skip_recompute']:
+            call_command('recompute_stats', stdout=self.stdout)
+
+    def validate(self, files):
+        """Проверяет файлы и сообщает о нарушениях с номерами строк."""
+        started = time.monotonic()
+        total = 0
+        for model, violations in validate_files(
+            files, build_stages(files)
+        ).items():
+            for row_number, message in violations:
+                self.stdout.write(self.style.ERROR(
+                    f'{model.__name__}, строка {row_number}: {message}'))
+            total += len(violations)
+        seconds = time.monotonic() - started
+        if total:
+            raise CommandError(
+                f'Найдено нарушений: {total}, проверка заняла {seconds:.2f} с')
+        self.stdout.write(self.style.SUCCESS(
+            f'Нарушений не найдено, проверка заняла {seconds:.2f} с'))
+
+    def load_stages(self, files, options):
+        """
+        Загружает таблицы по этапам графа зависимостей.
+        Возвращает время и прогресс таблиц каждого этапа.
+        """
+        stages = []
+        max_workers = options['workers']
+        if connection.vendor == 'sqlite':
+            # SQLite допускает одного писателя: транзакции потоков, которые
+            # читают перед записью, сериализуются, иначе в режиме WAL
+            # они сразу получают "database is locked".
+            self.write_lock = threading.Lock()
+            if connection.is_in_memory_db():
+                # Потоки не могут одновременно писать в общую базу в памяти.
+                max_workers = 1
+        for number, stage in enumerate(build_stages(files), start=1):
+            stage_started = time.monotonic()
+            workers = max(1, min(max_workers, len(stage)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        self.load_table, model, files[model], options
+                    )
+                    for model in stage
+                ]
+                tables = [future.result() for future in futures]
+            seconds = time.monotonic() - stage_started
+            stages.append((number, seconds, tables))
             self.stdout.write(self.style.SUCCESS(
-                f'Загрузка данных для модели {model.__name__} начата'))
-            self.load_data(model, csv_path)
+                f'Этап {number} ('
+                + ', '.join(model.__name__ for model in stage)
+                + f') завершен за {seconds:.2f} с'))
+        return stages
+
+    def write_stats(self, path, stages, total):
+        """Записывает сводку загрузки в JSON-файл."""
+        stats = {
+            'tables': {
+                progress.name: progress.as_dict()
+                for _, _, tables in stages
+                for progress in tables if progress is not None
+            },
+            'stages': [
+                {
+                    'number': number,
+                    'seconds': round(seconds, 3),
+                    'tables': [
+                        progress.name for progress in tables
+                        if progress is not None
+                    ],
+                }
+                for number, seconds, tables in stages
+            ],
+            'total_seconds': round(total, 3),
+        }
+        with open(path, 'w', encoding='utf-8') as stats_file:
+            json.dump(stats, stats_file, ensure_ascii=False, indent=2)
+
+    def load_table(self, model, csv_path, options):
+        """
+        Загружает одну таблицу в отдельном потоке.
+        Возвращает прогресс загрузки или None, если таблица уже загружена.
+        """
+        self.stdout.write(self.style.SUCCESS(
+            f'Загрузка данных для модели {model.__name__} начата'))
+        try:
+            progress = self.load_data(
+                model,
+                csv_path,
+                options['batch_size'],
+                incremental=options['incremental'],
+                delete_missing=options['delete_missing'],
+                resume=options['resume'],
+                progress_interval=options['progress_interval'],
+            )
+        finally:
+            connection.close()
+        self.stdout.write(self.style.SUCCESS(
+            f'Загрузка данных для модели {model.__name__} завершена'))
+        return progress
+
+    def load_data(self, model, csv_path, batch_size=BATCH_SIZE,
+                  incremental=False, delete_missing=False, resume=False,
+                  progress_interval=PROGRESS_INTERVAL):
+        """
+        Загружает данные из CSV-файла в модель Django.
+        Возвращает TableProgress или None, если таблица уже загружена.
+        """
+        with self.write_lock:
+            checkpoint = self.get_checkpoint(model, csv_path, resume)
+        if checkpoint.finished:
+            self.stdout.write(self.style.WARNING(
+                f'Модель {model.__name__} уже загружена из {csv_path}'))
+            return None
+        if checkpoint.rows:
+            self.stdout.write(self.style.WARNING(
+                f'Загрузка {model.__name__} продолжается со строки '
+                f'{checkpoint.rows + 1}'))
+        resolver = ReferenceResolver(model)
+        progress = TableProgress(
+            model.__name__,
+            get_data_size(csv_path),
+            checkpoint.offset,
+            progress_interval,
+            lambda line: self.stdout.write(line),
+        )
+        stats = Counter()
+        source_ids = set() if delete_missing else None
+        pk_name = model._meta.pk.attname
+        rows = read_rows(csv_path, checkpoint.offset)
+        for batch in iter_batches(rows, batch_size):
+            offset = batch[-1][0]
+            batch = [
+                (checkpoint.rows + index, data)
+                for index, (_, data) in enumerate(batch, start=1)
+            ]
+            if source_ids is not None:
+                source_ids.update(int(data[pk_name]) for _, data in batch)
+            resolved = resolver.resolve(batch)
+            with self.write_lock, transaction.atomic():
+                errors = self.save_resolved(
+                    model, resolved, incremental, stats
+                )
+                checkpoint.offset = offset
+                checkpoint.rows += len(batch)
+                checkpoint.batches += 1
+                checkpoint.save()
+            progress.batch_committed(
+                len(batch), len(batch) - len(resolved), errors, offset
+            )
+        with self.write_lock:
+            if source_ids is not None:
+                stats['deleted'] = self.delete_missing(model, source_ids)
+            checkpoint.finished = True
+            checkpoint.save()
+        progress.finish()
+        self.stdout.write(self.style.SUCCESS(progress.format()))
+        self.report_missing(model, resolver)
+        if incremental:
             self.stdout.write(self.style.SUCCESS(
-                f'Загрузка данных для модели {model.__name__} завершена'))
-        self.stdout.write(self.style.SUCCESS('Все данные загружены'))
-
-    def load_data(self, model, csv_path):
-        """Загружает данные из CSV-файла в модель Django."""
-        with open(csv_path, 'r', encoding='utf-8') as csv_file:
-            reader = csv.DictReader(csv_file)
-            for data in reader:
-                self.process_model_data(model, data)
-                try:
-                    instance = model(**data)
+                f'{model.__name__}: добавлено {stats["created"]}, '
+                f'обновлено {stats["updated"]}, '
+                f'без изменений {stats["unchanged"]}, '
+                f'удалено {stats["deleted"]}'))
+        return progress
+
+    def get_checkpoint(self, model, csv_path, resume):
+        """
+        Возвращает контрольную точку таблицы.
+        Без --resume или при смене файла загрузка начинается сначала.
+        """
+        checkpoint, created = ImportCheckpoint.objects.get_or_create(
+            table=model._meta.db_table,
+            defaults={'path': str(csv_path)},
+        )
+        if created:
+            return checkpoint
+        if resume and checkpoint.path == str(csv_path):
+            return checkpoint
+        if resume:
+            self.stdout.write(self.style.WARNING(
+                f'Контрольная точка {model.__name__} относится к файлу '
+                f'{checkpoint.path}, загрузка начинается сначала'))
+        checkpoint.path = str(csv_path)
+        checkpoint.offset = checkpoint.rows = checkpoint.batches = 0
+        checkpoint.finished = False
+        checkpoint.save()
+        return checkpoint
+
+    def save_resolved(self, model, batch, incremental, stats):
+        """
+        Сохраняет пачку строк с проверенными ссылками.
+        Возвращает число строк, которые не удалось сохранить.
+        """
+        if incremental:
+            return self.sync_batch(model, batch, stats)
+        return self.save_batch(model, [
+            (row_number, model(**data)) for row_number, data in batch
+        ])
+
+    def save_batch(self, model, batch):
+        """
+        Сохраняет пачку строк одним INSERT в транзакции.
+        Возвращает число строк, которые не удалось сохранить.
+        """
+        if not batch:
+            return 0
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(
+                    [instance for _, instance in batch]
+                )
+        except IntegrityError:
+            return len(batch) - len(self.save_rows(model, batch))
+        return 0
+
+    def save_rows(self, model, batch):
+        """
+        Сохраняет строки пачки по одной, сообщая об ошибочных строках.
+        Возвращает успешно сохраненные объекты.
+        """
+        saved = []
+        for row_number, instance in batch:
+            try:
+                with transaction.atomic():
                     instance.save()
-                except IntegrityError as e:
-                    self.stdout.write(self.style.ERROR(
-                        f'Ошибка при сохранении {model.__name__}: {e}'))
-
-    def process_model_data(self, model, data):
-        """Обработка данных перед созданием экземпляра модели."""
-        if model == Title:
-            category, created = Category.objects.get_or_create(
-                pk=int(data['category']),
-                defaults={'slug': slugify(data['category'])}
+            except IntegrityError as e:
+                self.stdout.write(self.style.ERROR(
+                    f'Ошибка при сохранении {model.__name__}, '
+                    f'строка {row_number}: {e}'))
+            else:
+                saved.append(instance)
+        return saved
+
+    def sync_batch(self, model, batch, stats):
+        """
+        Добавляет новые и обновляет измененные строки пачки,
+        сверяясь с сохраненными контрольными суммами.
+        Возвращает число строк, которые не удалось сохранить.
+        """
+        table = model._meta.db_table
+        pk_name = model._meta.pk.attname
+        checksums = {
+            int(data[pk_name]): get_checksum(data) for _, data in batch
+        }
+        stored = dict(filter_in_chunks(
+            ImportRowChecksum.objects.filter(table=table),
+            'row_id', checksums, 'row_id', 'checksum',
+        ))
+        existing = set(filter_in_chunks(model.objects, 'pk', checksums, 'pk'))
+        to_create, to_update = [], []
+        for row_number, data in batch:
+            pk = int(data[pk_name])
+            if pk not in existing:
+                to_create.append((row_number, model(**data)))
+            elif stored.get(pk) != checksums[pk]:
+                to_update.append((row_number, model(**data)))
+        stats['unchanged'] += len(batch) - len(to_create) - len(to_update)
+        if not to_create and not to_update:
+            return 0
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(
+                    [instance for _, instance in to_create]
+                )
+                if to_update:
+                    model.objects.bulk_update(
+                        [instance for _, instance in to_update],
+                        self.get_update_fields(model, batch[0][1]),
+                    )
+                self.save_checksums(table, checksums, [
+                    int(instance.pk) for _, instance in to_create + to_update
+                ])
+        except IntegrityError:
+            saved = self.save_rows(model, to_create + to_update)
+            saved_pks = [int(instance.pk) for instance in saved]
+            self.save_checksums(table, checksums, saved_pks)
+            created = len(set(saved_pks) - existing)
+            stats['created'] += created
+            stats['updated'] += len(saved_pks) - created
+            return len(to_create) + len(to_update) - len(saved_pks)
+        stats['created'] += len(to_create)
+        stats['updated'] += len(to_update)
+        return 0
+
+    def get_update_fields(self, model, data):
+        """Возвращает поля модели, присутствующие в строке CSV."""
+        return [
+            field.name for field in model._meta.concrete_fields
+            if field.attname in data
+            and not field.primary_key
+            and not getattr(field, 'auto_now_add', False)
+        ]
+
+    def save_checksums(self, table, checksums, pks):
+        """Перезаписывает контрольные суммы сохраненных строк."""
+        with transaction.atomic():
+            for chunk in iter_batches(pks, get_in_chunk_size()):
+                ImportRowChecksum.objects.filter(
+                    table=table, row_id__in=chunk
+                ).delete()
+                ImportRowChecksum.objects.bulk_create([
+                    ImportRowChecksum(
+                        table=table, row_id=pk, checksum=checksums[pk]
+                    )
+                    for pk in chunk
+                ])
+
+    def delete_missing(self, model, source_ids):
+        """Удаляет строки модели, отсутствующие в источнике."""
+        table = model._meta.db_table
+        stale = [
+            pk for pk in model.objects.values_list('pk', flat=True)
+            .iterator() if pk not in source_ids
+        ]
+        for chunk in iter_batches(stale, get_in_chunk_size()):
+            with transaction.atomic():
+                model.objects.filter(pk__in=chunk).delete()
+                ImportRowChecksum.objects.filter(
+                    table=table, row_id__in=chunk
+                ).delete()
+        return len(stale)
+
+    def report_missing(self, model, resolver):
+        """Выводит сводку по строкам со ссылками на несуществующие объекты."""
+        for field_name, count in resolver.missing_rows.items():
+            ids = ', '.join(
+                str(pk) for pk in sorted(
+                    resolver.missing_ids[field_name], key=str
+                )
             )
-            data['category'] = category
-        elif model in (Review, Comment):
-            self.process_user_data(data)
-
-    def process_user_data(self, data):
-        """Обработка данных пользователя."""
-        user_id = int(data.get('author', 0))
-        user, created = User.objects.get_or_create(pk=user_id)
-        if not user_id:
             self.stdout.write(self.style.WARNING(
-                'Ключ "author" отсутствует в данных для Review или Comment'))
-        data['author'] = user
+                f'Пропущено строк {model.__name__}: {count}, '
+                f'не найдены {field_name}, например: {ids}'))
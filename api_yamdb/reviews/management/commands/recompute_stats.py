@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api_yamdb.consts import SCORE_MAX, SCORE_MIN
+from reviews.models import TitleStats
+from reviews.signals import data_changed
+from reviews.title_stats import (
+    FETCH_SIZE,
+    WRITE_BATCH_SIZE,
+    recompute_title_stats
+)
+
+
+class Command(BaseCommand):
+    """
+    Пересчет статистики произведений: рейтинга, числа отзывов
+    и распределения оценок.
+
+    Пары (title_id, score) всех отзывов читаются потоково кусками
+    по --fetch-size строк и суммируются через numpy.bincount, затем
+    статистика записывается пачками bulk_create в одной транзакции.
+    Запускается автоматически после load_csv.
+
+    Использование:
+    python manage.py recompute_stats [--fetch-size 100000]
+    [--batch-size 1000]
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fetch-size',
+            type=int,
+            default=FETCH_SIZE,
+            help='Количество отзывов, читаемых из базы за раз.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=WRITE_BATCH_SIZE,
+            help='Количество строк статистики в одной пачке bulk_create.',
+        )
+
+    def handle(self, *args, **kwargs):
+        """Метод обработки для команды управления."""
+        started = time.monotonic()
+        count, skipped = recompute_title_stats(
+            kwargs['fetch_size'], kwargs['batch_size']
+        )
+        data_changed.send(sender=TitleStats, models=(TitleStats,))
+        if skipped:
+            self.stdout.write(self.style.WARNING(
+                f'Пропущено отзывов с оценкой вне {SCORE_MIN}..'
+                f'{SCORE_MAX}: {skipped}'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Статистика {count} произведений пересчитана '
+            f'за {time.monotonic() - started:.2f} с'))
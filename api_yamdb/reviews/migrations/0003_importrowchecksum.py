@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-19 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportRowChecksum',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=63, verbose_name='Таблица')),
+                ('row_id', models.BigIntegerField(verbose_name='Идентификатор строки')),
+                ('checksum', models.CharField(max_length=32, verbose_name='Контрольная сумма')),
+            ],
+            options={
+                'verbose_name': 'контрольная сумма строки',
+                'verbose_name_plural': 'Контрольные суммы строк',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importrowchecksum',
+            constraint=models.UniqueConstraint(fields=('table', 'row_id'), name='reviews_importrowchecksum_unique_row'),
+        ),
+    ]
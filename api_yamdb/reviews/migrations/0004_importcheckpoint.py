@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-19 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_importrowchecksum'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=63, unique=True, verbose_name='Таблица')),
+                ('path', models.CharField(max_length=1024, verbose_name='Путь к файлу')),
+                ('offset', models.BigIntegerField(default=0, verbose_name='Смещение в байтах')),
+                ('rows', models.BigIntegerField(default=0, verbose_name='Обработано строк')),
+                ('batches', models.PositiveIntegerField(default=0, verbose_name='Сохранено пачек')),
+                ('finished', models.BooleanField(default=False, verbose_name='Загрузка завершена')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+            ],
+            options={
+                'verbose_name': 'контрольная точка загрузки',
+                'verbose_name_plural': 'Контрольные точки загрузки',
+            },
+        ),
+    ]
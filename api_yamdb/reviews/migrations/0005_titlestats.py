@@ -0,0 +1,53 @@
+# Generated by Django 3.2 on 2026-10-19 10:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+
+SCORE_MIN = 1
+
+SCORE_MAX = 10
+
+
+def fill_title_stats(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    TitleStats = apps.get_model('reviews', 'TitleStats')
+    stats = {}
+    for title_id, score, count in Review.objects.values_list(
+        'title_id', 'score'
+    ).annotate(count=Count('id')).order_by():
+        title_stats = stats.setdefault(title_id, TitleStats(
+            title_id=title_id,
+            score_histogram=[0] * (SCORE_MAX - SCORE_MIN + 1),
+        ))
+        title_stats.score_histogram[score - SCORE_MIN] += count
+        title_stats.reviews_count += count
+        title_stats.score_sum += score * count
+    for title_stats in stats.values():
+        title_stats.rating = title_stats.score_sum / title_stats.reviews_count
+    TitleStats.objects.bulk_create(stats.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_importcheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleStats',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('reviews_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('score_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('rating', models.FloatField(null=True, verbose_name='Рейтинг')),
+                ('score_histogram', models.JSONField(default=list, help_text='Количество оценок от 1 до 10.', verbose_name='Количество оценок')),
+            ],
+            options={
+                'verbose_name': 'статистика произведения',
+                'verbose_name_plural': 'Статистика произведений',
+            },
+        ),
+        migrations.RunPython(fill_title_stats, migrations.RunPython.noop),
+    ]
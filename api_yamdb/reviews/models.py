@@ -3,8 +3,11 @@ from django.db import models
 
 from api_yamdb.consts import (
     MAX_LENGTH,
+    LENGTH_CHECKSUM,
     LENGTH_NAME,
+    LENGTH_PATH,
     LENGTH_SLUG,
+    LENGTH_TABLE_NAME,
     SCORE_MAX,
     SCORE_MIN
 )
@@ -180,3 +183,113 @@ class Comment(TextAuthorPubdateModel):
             f'{self.author.username} - '
             f'{self.pub_date}'
         )
+
+
+class TitleStats(models.Model):
+    """
+    Модель производных данных произведения: рейтинга, числа отзывов
+    и распределения оценок. Пересчитывается командой recompute_stats
+    после загрузки данных и при изменении отзывов.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        verbose_name='Произведение',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+    )
+    reviews_count = models.PositiveIntegerField(
+        'Количество отзывов',
+        default=0,
+    )
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+    )
+    rating = models.FloatField(
+        'Рейтинг',
+        null=True,
+    )
+    score_histogram = models.JSONField(
+        'Количество оценок',
+        default=list,
+        help_text=f'Количество оценок от {SCORE_MIN} до {SCORE_MAX}.',
+    )
+
+    class Meta:
+        verbose_name = 'статистика произведения'
+        verbose_name_plural = 'Статистика произведений'
+
+    def __str__(self):
+        return f'{self.title_id} - {self.reviews_count} - {self.rating}'
+
+
+class ImportRowChecksum(models.Model):
+    """Модель контрольной суммы строки, загруженной из CSV."""
+
+    table = models.CharField(
+        'Таблица',
+        max_length=LENGTH_TABLE_NAME,
+    )
+    row_id = models.BigIntegerField(
+        'Идентификатор строки',
+    )
+    checksum = models.CharField(
+        'Контрольная сумма',
+        max_length=LENGTH_CHECKSUM,
+    )
+
+    class Meta:
+        verbose_name = 'контрольная сумма строки'
+        verbose_name_plural = 'Контрольные суммы строк'
+        constraints = [
+            models.UniqueConstraint(
+                name='%(app_label)s_%(class)s_unique_row',
+                fields=['table', 'row_id'],
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.table} - {self.row_id} - {self.checksum}'
+
+
+class ImportCheckpoint(models.Model):
+    """Модель контрольной точки загрузки CSV-файла."""
+
+    table = models.CharField(
+        'Таблица',
+        max_length=LENGTH_TABLE_NAME,
+        unique=True,
+    )
+    path = models.CharField(
+        'Путь к файлу',
+        max_length=LENGTH_PATH,
+    )
+    offset = models.BigIntegerField(
+        'Смещение в байтах',
+        default=0,
+    )
+    rows = models.BigIntegerField(
+        'Обработано строк',
+        default=0,
+    )
+    batches = models.PositiveIntegerField(
+        'Сохранено пачек',
+        default=0,
+    )
+    finished = models.BooleanField(
+        'Загрузка завершена',
+        default=False,
+    )
+    updated_at = models.DateTimeField(
+        'Дата обновления',
+        auto_now=True,
+    )
+
+    class Meta:
+        verbose_name = 'контрольная точка загрузки'
+        verbose_name_plural = 'Контрольные точки загрузки'
+
+    def __str__(self):
+        return f'{self.table} - {self.path} - {self.offset}'
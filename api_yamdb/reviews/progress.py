@@ -0,0 +1,83 @@
+import time
+from datetime import timedelta
+
+PROGRESS_INTERVAL = 5
+
+
+class TableProgress:
+    """
+    Прогресс загрузки одной таблицы.
+    Считает строки, пачки, ошибки и пропущенные строки, скорость
+    загрузки и оставшееся время. Оценка времени строится по доле
+    прочитанных байт и доступна только для несжатых файлов.
+    """
+
+    def __init__(self, name, total_bytes=None, offset=0,
+                 interval=PROGRESS_INTERVAL, write=None):
+        self.name = name
+        self.total_bytes = total_bytes
+        self.start_offset = self.offset = offset
+        self.interval = interval
+        self.write = write
+        self.rows = self.saved = self.skipped = 0
+        self.errors = self.batches = 0
+        self.started = self.last_report = time.monotonic()
+        self.finished = None
+
+    @property
+    def elapsed(self):
+        """Время загрузки в секундах."""
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def rows_per_second(self):
+        """Скорость загрузки в строках в секунду."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def eta(self):
+        """Оценка оставшегося времени в секундах или None."""
+        done = self.offset - self.start_offset
+        if not self.total_bytes or not done:
+            return None
+        return (self.total_bytes - self.offset) * self.elapsed / done
+
+    def batch_committed(self, rows, skipped, errors, offset):
+        """Учитывает сохраненную пачку и при необходимости выводит прогресс."""
+        self.rows += rows
+        self.skipped += skipped
+        self.errors += errors
+        self.saved += rows - skipped - errors
+        self.batches += 1
+        self.offset = offset
+        now = time.monotonic()
+        if self.write and now - self.last_report >= self.interval:
+            self.last_report = now
+            self.write(self.format())
+
+    def finish(self):
+        """Фиксирует время окончания загрузки."""
+        self.finished = time.monotonic()
+
+    def format(self):
+        """Возвращает строку прогресса."""
+        eta = self.eta
+        eta = '—' if eta is None else str(timedelta(seconds=round(eta)))
+        return (
+            f'{self.name}: {self.rows} строк, '
+            f'{self.rows_per_second:.0f} строк/с, пачек {self.batches}, '
+            f'ошибок {self.errors}, пропущено {self.skipped}, '
+            f'осталось {eta}'
+        )
+
+    def as_dict(self):
+        """Возвращает итоговую статистику для JSON-отчета."""
+        return {
+            'rows': self.rows,
+            'saved': self.saved,
+            'skipped': self.skipped,
+            'errors': self.errors,
+            'batches': self.batches,
+            'seconds': round(self.elapsed, 3),
+            'rows_per_second': round(self.rows_per_second, 1),
+        }
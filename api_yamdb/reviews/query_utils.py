@@ -0,0 +1,25 @@
+from django.db import connection
+
+from reviews.csv_utils import iter_batches
+
+IN_CHUNK_SIZE = 1000
+
+
+def get_in_chunk_size():
+    """
+    Возвращает размер списка для условия IN с запасом на один
+    дополнительный параметр запроса.
+    """
+    max_params = connection.features.max_query_params
+    return max_params - 1 if max_params else IN_CHUNK_SIZE
+
+
+def filter_in_chunks(queryset, lookup, values, *fields):
+    """
+    Выполняет values_list по условию lookup__in кусками,
+    не превышая лимит параметров запроса базы данных.
+    """
+    for chunk in iter_batches(values, get_in_chunk_size()):
+        yield from queryset.filter(
+            **{f'{lookup}__in': chunk}
+        ).order_by().values_list(*fields, flat=len(fields) == 1)
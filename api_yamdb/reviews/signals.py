@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from reviews.models import Review, TitleStats
+from reviews.sqlite_bulk import set_pragmas
+from reviews.title_stats import update_title_stats
+
+# Данные моделей models изменены в обход сигналов моделей:
+# массовой загрузкой, UPDATE или bulk_create.
+data_changed = Signal()
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Настраивает новое соединение SQLite значениями SQLITE_PRAGMAS:
+    журнал WAL позволяет читать во время записи, а busy_timeout
+    заставляет писателей ждать блокировку вместо ошибки
+    "database is locked".
+    """
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            set_pragmas(cursor, settings.SQLITE_PRAGMAS)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    """
+    Обновляет статистику произведения после изменения отзыва.
+    Пересчет откладывается до конца транзакции: при каскадном
+    удалении произведения его статистика не создается заново.
+    """
+    title_id = instance.title_id
+
+    def update():
+        update_title_stats(title_id)
+        data_changed.send(sender=TitleStats, models=(TitleStats,))
+
+    transaction.on_commit(update)
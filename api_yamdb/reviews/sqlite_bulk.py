@@ -0,0 +1,83 @@
+from contextlib import contextmanager
+
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+BULK_PRAGMAS = {
+    'synchronous': 'OFF',
+    'cache_size': -262144,
+    'temp_store': 'MEMORY',
+}
+
+
+def get_pragma(cursor, name):
+    """Возвращает текущее значение PRAGMA."""
+    cursor.execute(f'PRAGMA {name}')
+    return cursor.fetchone()[0]
+
+
+def set_pragmas(cursor, pragmas):
+    """Устанавливает значения PRAGMA для соединения."""
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def apply_bulk_pragmas(sender, connection, **kwargs):
+    """Настраивает новые соединения потоков загрузки."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            set_pragmas(cursor, BULK_PRAGMAS)
+
+
+def drop_secondary_indexes(cursor, tables, statements):
+    """
+    Удаляет неуникальные индексы таблиц.
+    SQL для пересоздания каждого удаленного индекса сразу добавляется
+    в statements, поэтому при сбое на середине список не теряется.
+    """
+    for table in tables:
+        cursor.execute(f'PRAGMA index_list("{table}")')
+        names = [
+            name for _, name, unique, origin, *_ in cursor.fetchall()
+            if not unique and origin == 'c'
+        ]
+        for name in names:
+            cursor.execute(
+                "SELECT sql FROM sqlite_master "
+                "WHERE type = 'index' AND name = %s",
+                [name],
+            )
+            statement = cursor.fetchone()[0]
+            cursor.execute(f'DROP INDEX "{name}"')
+            statements.append(statement)
+
+
+@contextmanager
+def sqlite_bulk_load(tables):
+    """
+    Режим массовой загрузки в SQLite.
+    На время загрузки включает журнал WAL, отключает synchronous,
+    увеличивает cache_size и удаляет неуникальные индексы таблиц tables.
+    После загрузки, в том числе неудачной, пересоздает индексы,
+    выполняет ANALYZE и возвращает прежние настройки.
+    """
+    with connection.cursor() as cursor:
+        saved = {
+            name: get_pragma(cursor, name)
+            for name in ('journal_mode', *BULK_PRAGMAS)
+        }
+    indexes = []
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode = WAL')
+            set_pragmas(cursor, BULK_PRAGMAS)
+            drop_secondary_indexes(cursor, tables, indexes)
+        connection_created.connect(apply_bulk_pragmas)
+        yield
+    finally:
+        connection_created.disconnect(apply_bulk_pragmas)
+        with connection.cursor() as cursor:
+            for statement in indexes:
+                cursor.execute(statement)
+            cursor.execute('ANALYZE')
+            set_pragmas(cursor, saved)
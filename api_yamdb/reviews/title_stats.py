@@ -0,0 +1,128 @@
+import numpy as np
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Max
+
+from api_yamdb.consts import SCORE_MAX, SCORE_MIN
+from reviews.csv_utils import iter_batches
+from reviews.models import Review, Title, TitleStats
+
+FETCH_SIZE = 100000
+
+WRITE_BATCH_SIZE = 1000
+
+
+def iter_score_pairs(fetch_size=FETCH_SIZE):
+    """
+    Потоково читает пары (title_id, score) всех отзывов.
+    Возвращает массивы NumPy формы (n, 2) не длиннее fetch_size.
+    """
+    sql, params = Review.objects.order_by().values_list(
+        'title_id', 'score'
+    ).query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        while rows := cursor.fetchmany(fetch_size):
+            yield np.array(rows, dtype=np.int64)
+
+
+def count_scores(fetch_size=FETCH_SIZE):
+    """
+    Считает оценки произведений через bincount.
+    Возвращает матрицу (строка — id произведения, колонка — количество
+    оценок SCORE_MIN..SCORE_MAX) и число отзывов с оценкой вне этого
+    диапазона: они в статистику не попадают. Размер матрицы берется
+    из Max(pk) произведений и растет, если в потоке встретится
+    больший id, например у произведения, добавленного после запроса.
+    """
+    width = SCORE_MAX - SCORE_MIN + 1
+    size = (Title.objects.aggregate(max_id=Max('pk'))['max_id'] or 0) + 1
+    counts = np.zeros((size, width), dtype=np.int64)
+    skipped = 0
+    for pairs in iter_score_pairs(fetch_size):
+        valid = (pairs[:, 1] >= SCORE_MIN) & (pairs[:, 1] <= SCORE_MAX)
+        skipped += int(np.count_nonzero(~valid))
+        pairs = pairs[valid]
+        if not len(pairs):
+            continue
+        size = int(pairs[:, 0].max()) + 1
+        if size > len(counts):
+            counts = np.concatenate((counts, np.zeros(
+                (max(size, 2 * len(counts)) - len(counts), width),
+                dtype=np.int64,
+            )))
+        counts[:size] += np.bincount(
+            pairs[:, 0] * width + pairs[:, 1] - SCORE_MIN,
+            minlength=size * width,
+        ).reshape(size, width)
+    return counts, skipped
+
+
+def build_stats(histograms):
+    """Возвращает объекты TitleStats для произведений с отзывами."""
+    reviews_count = histograms.sum(axis=1)
+    score_sum = histograms @ np.arange(SCORE_MIN, SCORE_MAX + 1)
+    title_ids = np.flatnonzero(reviews_count)
+    ratings = score_sum[title_ids] / reviews_count[title_ids]
+    for title_id, rating in zip(title_ids.tolist(), ratings.tolist()):
+        yield TitleStats(
+            title_id=title_id,
+            reviews_count=int(reviews_count[title_id]),
+            score_sum=int(score_sum[title_id]),
+            rating=rating,
+            score_histogram=histograms[title_id].tolist(),
+        )
+
+
+def recompute_title_stats(fetch_size=FETCH_SIZE,
+                          batch_size=WRITE_BATCH_SIZE):
+    """
+    Пересчитывает статистику всех произведений за один проход
+    по отзывам. Старая статистика заменяется в одной транзакции.
+    Возвращает число произведений с отзывами и число пропущенных
+    отзывов с оценкой вне SCORE_MIN..SCORE_MAX.
+    """
+    histograms, skipped = count_scores(fetch_size)
+    count = 0
+    with transaction.atomic():
+        TitleStats.objects.all().delete()
+        for stats in iter_batches(build_stats(histograms), batch_size):
+            TitleStats.objects.bulk_create(stats)
+            count += len(stats)
+    return count, skipped
+
+
+def update_title_stats(title_id):
+    """
+    Пересчитывает статистику одного произведения.
+    Если отзывов нет, например произведение удалено,
+    статистика удаляется. Оценки вне SCORE_MIN..SCORE_MAX,
+    например загруженные из CSV без проверки, не учитываются.
+    """
+    histogram = [0] * (SCORE_MAX - SCORE_MIN + 1)
+    for score, count in Review.objects.filter(
+        title_id=title_id, score__gte=SCORE_MIN, score__lte=SCORE_MAX
+    ).values_list('score').annotate(count=Count('pk')).order_by():
+        histogram[score - SCORE_MIN] = count
+    reviews_count = sum(histogram)
+    if not reviews_count:
+        TitleStats.objects.filter(title_id=title_id).delete()
+        return
+    score_sum = sum(
+        score * count
+        for score, count in enumerate(histogram, start=SCORE_MIN)
+    )
+    # UPDATE и INSERT выполняются отдельными запросами без транзакции:
+    # в SQLite транзакция, которая сначала читает, а потом пишет,
+    # сразу получает "database is locked" при конкурентной записи.
+    stats = {
+        'reviews_count': reviews_count,
+        'score_sum': score_sum,
+        'rating': score_sum / reviews_count,
+        'score_histogram': histogram,
+    }
+    if TitleStats.objects.filter(title_id=title_id).update(**stats):
+        return
+    try:
+        TitleStats.objects.create(title_id=title_id, **stats)
+    except IntegrityError:
+        TitleStats.objects.filter(title_id=title_id).update(**stats)
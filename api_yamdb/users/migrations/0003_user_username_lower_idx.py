@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-19 11:31
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_user_email_lower_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='users_user_username_lower_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 
 from api_yamdb.consts import LENGTH_EMAIL, LENGTH_USERNAME
@@ -46,6 +47,12 @@ class User(AbstractUser):
         verbose_name = 'пользователь'
         verbose_name_plural = 'Пользователи'
         ordering = ('username',)
+        indexes = (
+            models.Index(Lower('email'), name='users_user_email_lower_idx'),
+            models.Index(
+                Lower('username'), name='users_user_username_lower_idx'
+            ),
+        )
 
     def __str__(self):
         return f'{self.username} - {self.email} - {self.role}'
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    from api.response_cache import get_cache
+    get_cache().clear()
+    yield
+    get_cache().clear()
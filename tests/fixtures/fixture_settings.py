@@ -0,0 +1,27 @@
+import sys
+from importlib import import_module
+
+import pytest
+
+PRODUCTION_MODULES = (
+    'api_yamdb.settings_production',
+    'api_yamdb.settings_api',
+)
+
+
+@pytest.fixture
+def production_env(monkeypatch):
+    monkeypatch.setenv('DJANGO_SECRET_KEY', 'test-secret-key')
+    monkeypatch.setenv('DJANGO_ALLOWED_HOSTS', 'localhost')
+
+
+@pytest.fixture
+def load_settings(production_env):
+    def load(name):
+        for module in PRODUCTION_MODULES:
+            sys.modules.pop(module, None)
+        return import_module(f'api_yamdb.{name}')
+
+    yield load
+    for module in PRODUCTION_MODULES:
+        sys.modules.pop(module, None)
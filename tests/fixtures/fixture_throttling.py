@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_throttle_buckets():
+    from api.throttling import local_storage
+    local_storage.clear()
+    yield
+    local_storage.clear()
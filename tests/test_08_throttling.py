@@ -0,0 +1,88 @@
+import time
+from http import HTTPStatus
+
+import pytest
+
+from api.throttling import LocalBucketStorage, TokenBucketThrottle
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08AuthThrottling:
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    @pytest.fixture
+    def low_rates(self, monkeypatch):
+        monkeypatch.setattr(TokenBucketThrottle, 'THROTTLE_RATES', {
+            'signup_ip': '3/hour',
+            'signup_username': '2/hour',
+            'token_ip': '3/hour',
+            'token_username': '2/hour',
+        })
+
+    def test_01_signup_username_throttled(self, client, low_rates):
+        data = {'username': 'throttled', 'email': 'throttled@yamdb.fake'}
+        for _ in range(2):
+            response = client.post(self.URL_SIGNUP, data=data)
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что POST-запросы к `{self.URL_SIGNUP}` с одним и '
+            'тем же `username` сверх лимита возвращают ответ со статусом 429.'
+        )
+        assert 'Retry-After' in response, (
+            'Проверьте, что ответ со статусом 429 содержит заголовок '
+            '`Retry-After`.'
+        )
+
+    def test_02_token_ip_throttled(self, client, low_rates,
+                                   django_assert_num_queries):
+        for index in range(3):
+            client.post(
+                self.URL_TOKEN,
+                data={'username': f'user{index}', 'confirmation_code': '1'}
+            )
+        with django_assert_num_queries(0):
+            response = client.post(
+                self.URL_TOKEN,
+                data={'username': 'other', 'confirmation_code': '1'}
+            )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что POST-запросы к `{self.URL_TOKEN}` с одного '
+            'IP-адреса сверх лимита отклоняются до обращения к базе данных.'
+        )
+
+    def test_03_local_storage_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(LocalBucketStorage, 'max_entries', 10)
+        storage = LocalBucketStorage()
+        storage.consume('active', 5, 1 / 3600)
+        for index in range(100):
+            storage.consume(f'ip{index}', 5, 1 / 3600)
+            storage.consume('active', 5, 1 / 3600)
+        assert len(storage._buckets) <= 10, (
+            'Проверьте, что число корзин в памяти не превышает '
+            '`max_entries`, даже если ни одна корзина не наполнилась.'
+        )
+        assert 'active' in storage._buckets, (
+            'Проверьте, что при переполнении удаляются давно '
+            'не использованные корзины.'
+        )
+        assert 'ip0' not in storage._buckets
+
+    def test_04_eviction_does_not_rebuild_storage(self, monkeypatch):
+        monkeypatch.setattr(LocalBucketStorage, 'max_entries', 10)
+        storage = LocalBucketStorage()
+        buckets = storage._buckets
+        for index in range(100):
+            storage.consume(f'ip{index}', 5, 1 / 3600)
+        assert storage._buckets is buckets, (
+            'Проверьте, что при переполнении корзины удаляются из '
+            'начала очереди, а не пересборкой всего хранилища.'
+        )
+        storage.clear()
+        storage.consume('fast', 1, 1000)
+        time.sleep(0.01)
+        storage.consume('other', 5, 1 / 3600)
+        assert 'fast' not in storage._buckets, (
+            'Проверьте, что наполнившиеся корзины удаляются.'
+        )
@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09BulkUsers:
+    URL_SET_ROLE = '/api/v1/users/bulk/set-role/'
+    URL_DEACTIVATE = '/api/v1/users/bulk/deactivate/'
+
+    def test_01_bulk_not_admin(self, user_client, moderator_client):
+        data = {'usernames': ['TestUser'], 'role': 'admin'}
+        for client in (user_client, moderator_client):
+            response = client.post(self.URL_SET_ROLE, data=data,
+                                   format='json')
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                f'Проверьте, что POST-запрос к `{self.URL_SET_ROLE}` от '
+                'пользователя без прав администратора возвращает ответ со '
+                'статусом 403.'
+            )
+
+    def test_02_bulk_set_role(self, admin_client, admin, user, moderator,
+                              django_user_model, django_assert_max_num_queries):
+        data = {
+            'usernames': [user.username, moderator.username, admin.username,
+                          'missing'],
+            'role': 'moderator',
+        }
+        with django_assert_max_num_queries(8):
+            response = admin_client.post(self.URL_SET_ROLE, data=data,
+                                         format='json')
+        assert response.status_code == HTTPStatus.OK
+        statuses = {
+            item['username']: item['status']
+            for item in response.json()['results']
+        }
+        assert statuses == {
+            user.username: 'updated',
+            moderator.username: 'updated',
+            admin.username: 'skipped',
+            'missing': 'not_found',
+        }, (
+            f'Проверьте, что ответ на POST-запрос к `{self.URL_SET_ROLE}` '
+            'содержит результат для каждого переданного `username`.'
+        )
+        user.refresh_from_db()
+        admin.refresh_from_db()
+        assert user.role == 'moderator'
+        assert admin.role == 'admin'
+
+    def test_03_bulk_deactivate(self, admin_client, user, user_client):
+        response = admin_client.post(
+            self.URL_DEACTIVATE,
+            data={'usernames': [user.username]},
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert not user.is_active
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что деактивированный пользователь теряет доступ '
+            'к API.'
+        )
+
+    def test_04_bulk_invalid_data(self, admin_client):
+        response = admin_client.post(
+            self.URL_SET_ROLE,
+            data={'usernames': [], 'role': 'superadmin'},
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert {'usernames', 'role'} <= set(response.json())
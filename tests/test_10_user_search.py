@@ -0,0 +1,61 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10UserSearch:
+    USERS_URL = '/api/v1/users/'
+
+    def get_usernames(self, client, query):
+        response = client.get(f'{self.USERS_URL}?{query}')
+        assert response.status_code == HTTPStatus.OK
+        return {item['username'] for item in response.json()['results']}
+
+    def test_01_prefix_search_by_default(self, admin_client, admin, user,
+                                         moderator):
+        assert self.get_usernames(admin_client, 'search=TestMod') == {
+            moderator.username
+        }, (
+            f'Проверьте, что `{self.USERS_URL}?search=` ищет пользователей '
+            'по началу `username`.'
+        )
+        assert self.get_usernames(admin_client, 'search=User') == set(), (
+            f'Проверьте, что `{self.USERS_URL}?search=` по умолчанию не '
+            'ищет по подстроке.'
+        )
+
+    def test_02_contains_search(self, admin_client, admin, user):
+        assert self.get_usernames(
+            admin_client, 'search=User&search_mode=contains'
+        ) == {user.username}
+
+    def test_03_email_search(self, admin_client, admin, user):
+        assert self.get_usernames(
+            admin_client, 'email=TESTUSER@yamdb.fake'
+        ) == {user.username}, (
+            f'Проверьте, что `{self.USERS_URL}?email=` ищет пользователя '
+            'по email без учета регистра.'
+        )
+
+    def test_04_prefix_search_ignores_case(self, admin_client, admin,
+                                           moderator):
+        assert self.get_usernames(admin_client, 'search=testmod') == {
+            moderator.username
+        }, (
+            f'Проверьте, что `{self.USERS_URL}?search=` ищет по началу '
+            '`username` без учета регистра.'
+        )
+
+    def test_05_non_ascii_prefix(self, admin_client, admin,
+                                 django_user_model):
+        django_user_model.objects.create_user(
+            username='Иван', email='ivan@yamdb.fake'
+        )
+        assert self.get_usernames(admin_client, 'search=Иван') == {
+            'Иван'
+        }, (
+            f'Проверьте, что `{self.USERS_URL}?search=` находит '
+            '`username` с буквами не из ASCII.'
+        )
+        assert self.get_usernames(admin_client, 'search=Ив') == {'Иван'}
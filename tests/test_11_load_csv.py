@@ -0,0 +1,326 @@
+import bz2
+import gzip
+import json
+import shutil
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from reviews import sqlite_bulk
+from reviews.management.commands.load_csv import TABLES, Command, build_stages
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11LoadCSV:
+    EXPECTED_COUNTS = {
+        User: 5,
+        Category: 3,
+        Genre: 15,
+        Title: 32,
+        Review: 72,
+        Comment: 3,
+        Title.genre.through: 42,
+    }
+
+    def load(self, *args):
+        out = StringIO()
+        call_command('load_csv', *args, stdout=out)
+        return out.getvalue()
+
+    def check_counts(self):
+        for model, expected in self.EXPECTED_COUNTS.items():
+            assert model.objects.count() == expected, (
+                f'Проверьте, что команда `load_csv` загружает все строки '
+                f'для модели {model.__name__}.'
+            )
+
+    @pytest.mark.parametrize('batch_size', ('1', '7', '1000'))
+    def test_01_load_all_tables(self, batch_size):
+        self.load('--batch-size', batch_size)
+        self.check_counts()
+        assert Category.objects.get(pk=1).slug == 'movie'
+
+    def test_02_missing_references_summary(self, tmp_path, user,
+                                           django_assert_max_num_queries):
+        self.load()
+        csv_path = tmp_path / 'review.csv'
+        rows = ['id,title_id,text,author,score,pub_date']
+        rows += [
+            f'{1000 + index},1,text,{author},5,2019-09-24T21:08:21.567Z'
+            for index, author in enumerate((user.pk, 9999, 9999, 9998))
+        ]
+        csv_path.write_text('\n'.join(rows), encoding='utf-8')
+        Review.objects.filter(title_id=1).delete()
+        out = StringIO()
+        with django_assert_max_num_queries(12):
+            Command(stdout=out).load_data(Review, csv_path)
+        assert Review.objects.filter(title_id=1).count() == 1
+        assert not User.objects.filter(pk__in=(9998, 9999)).exists(), (
+            'Проверьте, что команда `load_csv` не создаёт пользователей, '
+            'на которых ссылаются строки CSV.'
+        )
+        assert out.getvalue().count('Пропущено строк Review: 3') == 1, (
+            'Проверьте, что отсутствующие ссылки выводятся одной сводкой.'
+        )
+
+    def test_03_dependency_stages(self):
+        stages = [set(stage) for stage in build_stages(TABLES)]
+        assert stages == [
+            {User, Genre, Category},
+            {Title},
+            {Title.genre.through, Review},
+            {Comment},
+        ], (
+            'Проверьте, что таблицы загружаются этапами по графу внешних '
+            'ключей: сначала независимые, затем зависящие от них.'
+        )
+
+    def test_04_compressed_files_from_data_dir(self, tmp_path):
+        data_dir = settings.BASE_DIR / 'static' / 'data'
+        for index, path in enumerate(sorted(data_dir.glob('*.csv'))):
+            opener, suffix = ((gzip.open, '.gz'), (bz2.open, '.bz2'))[index % 2]
+            with open(path, 'rb') as source:
+                with opener(tmp_path / f'{path.name}{suffix}', 'wb') as target:
+                    shutil.copyfileobj(source, target)
+        self.load('--data-dir', str(tmp_path))
+        self.check_counts()
+
+    def test_05_explicit_paths(self):
+        data_dir = settings.BASE_DIR / 'static' / 'data'
+        self.load(str(data_dir / 'genre.csv'), str(data_dir / 'category.csv'))
+        assert Genre.objects.count() == self.EXPECTED_COUNTS[Genre]
+        assert not Title.objects.exists(), (
+            'Проверьте, что при явном указании файлов `load_csv` загружает '
+            'только их.'
+        )
+
+    def test_06_incremental_sync(self, tmp_path):
+        data_dir = settings.BASE_DIR / 'static' / 'data'
+        for path in data_dir.glob('*.csv'):
+            shutil.copy(path, tmp_path / path.name)
+        output = self.load('--data-dir', str(tmp_path), '--incremental')
+        self.check_counts()
+        assert 'Genre: добавлено 15, обновлено 0' in output
+
+        output = self.load('--data-dir', str(tmp_path), '--incremental')
+        self.check_counts()
+        assert 'Review: добавлено 0, обновлено 0, без изменений 72' in output, (
+            'Проверьте, что повторная инкрементальная загрузка не изменяет '
+            'уже загруженные строки.'
+        )
+
+        genre_csv = tmp_path / 'genre.csv'
+        lines = genre_csv.read_text(encoding='utf-8').splitlines()
+        lines[1] = lines[1].replace('Драма', 'Трагедия')
+        del lines[-1]
+        genre_csv.write_text('\n'.join(lines), encoding='utf-8')
+        output = self.load(
+            str(genre_csv), '--incremental', '--delete-missing'
+        )
+        assert ('Genre: добавлено 0, обновлено 1, без изменений 13, '
+                'удалено 1') in output
+        assert Genre.objects.get(pk=1).name == 'Трагедия'
+        assert Genre.objects.count() == self.EXPECTED_COUNTS[Genre] - 1
+
+    def test_07_resume_from_checkpoint(self, monkeypatch):
+        self.load()
+        Review.objects.all().delete()
+        csv_path = settings.BASE_DIR / 'static' / 'data' / 'review.csv'
+        save_batch = Command.save_batch
+        calls = []
+
+        def failing_save_batch(command, model, batch):
+            calls.append(batch)
+            if len(calls) == 3:
+                raise RuntimeError('Сбой загрузки')
+            return save_batch(command, model, batch)
+
+        monkeypatch.setattr(Command, 'save_batch', failing_save_batch)
+        with pytest.raises(RuntimeError):
+            Command(stdout=StringIO()).load_data(
+                Review, csv_path, batch_size=10
+            )
+        assert Review.objects.count() == 20
+        monkeypatch.setattr(Command, 'save_batch', save_batch)
+
+        out = StringIO()
+        Command(stdout=out).load_data(
+            Review, csv_path, batch_size=10, resume=True
+        )
+        assert 'продолжается со строки 21' in out.getvalue()
+        assert 'Ошибка' not in out.getvalue(), (
+            'Проверьте, что при `--resume` уже сохранённые пачки не '
+            'загружаются повторно.'
+        )
+        assert Review.objects.count() == self.EXPECTED_COUNTS[Review]
+
+        out = StringIO()
+        Command(stdout=out).load_data(Review, csv_path, resume=True)
+        assert 'уже загружена' in out.getvalue()
+
+    def get_indexes(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+                "AND tbl_name IN ('reviews_review', 'reviews_comment')"
+            )
+            return set(cursor.fetchall())
+
+    def test_08_sqlite_bulk_mode(self, monkeypatch):
+        indexes = self.get_indexes()
+        self.load('--sqlite-bulk')
+        self.check_counts()
+        assert self.get_indexes() == indexes, (
+            'Проверьте, что после загрузки с `--sqlite-bulk` индексы '
+            'пересоздаются.'
+        )
+
+        def fail(*args, **kwargs):
+            raise RuntimeError('Сбой загрузки')
+
+        monkeypatch.setattr(Command, 'load_data', fail)
+        with pytest.raises(RuntimeError):
+            self.load('--sqlite-bulk')
+        assert self.get_indexes() == indexes, (
+            'Проверьте, что индексы пересоздаются и при неудачной загрузке.'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            assert cursor.fetchone()[0] != 0
+
+    def test_09_stats_json(self, tmp_path):
+        stats_path = tmp_path / 'stats.json'
+        output = self.load(
+            '--progress-interval', '0', '--stats-json', str(stats_path)
+        )
+        assert 'строк/с' in output, (
+            'Проверьте, что `load_csv` выводит скорость загрузки таблиц.'
+        )
+        stats = json.loads(stats_path.read_text(encoding='utf-8'))
+        assert set(stats) == {'tables', 'stages', 'total_seconds'}
+        assert len(stats['stages']) == 4
+        for model, expected in self.EXPECTED_COUNTS.items():
+            table = stats['tables'][model.__name__]
+            assert table['rows'] == expected, (
+                'Проверьте, что `--stats-json` содержит число строк таблиц.'
+            )
+            assert table['saved'] == expected
+            assert table['errors'] == 0
+            assert table['batches'] == 1
+
+    def test_10_validate_only(self, tmp_path):
+        data_dir = settings.BASE_DIR / 'static' / 'data'
+        for path in data_dir.glob('*.csv'):
+            shutil.copy(path, tmp_path / path.name)
+        output = self.load('--data-dir', str(tmp_path), '--validate-only')
+        assert 'Нарушений не найдено' in output
+        assert not User.objects.exists(), (
+            'Проверьте, что с `--validate-only` данные не загружаются.'
+        )
+
+        with open(tmp_path / 'titles.csv', 'a', encoding='utf-8') as file:
+            file.write('\n900,Будущее,2999,1\n901,Без категории,2000,77')
+        with open(tmp_path / 'review.csv', 'a', encoding='utf-8') as file:
+            file.write(
+                '\n900,1,text,100,11,2019-09-24T21:08:21.567Z'
+                '\n901,2,text,9999,5,2019-09-24T21:08:21.567Z'
+            )
+        with open(tmp_path / 'users.csv', 'a', encoding='utf-8') as file:
+            file.write('\n900,me,me@yamdb.fake,user,,,')
+        out = StringIO()
+        with pytest.raises(CommandError, match='Найдено нарушений: 6'):
+            call_command(
+                'load_csv', '--data-dir', str(tmp_path), '--validate-only',
+                stdout=out,
+            )
+        output = out.getvalue()
+        for violation in (
+            'User, строка 6: username',
+            'Title, строка 33: year',
+            'Title, строка 34: category',
+            'Review, строка 73: author, title: повторяет строку 1',
+            'Review, строка 73: score',
+            'Review, строка 74: author',
+        ):
+            assert violation in output, (
+                'Проверьте, что `--validate-only` сообщает о каждом '
+                'нарушении с номером строки.'
+            )
+        assert not Title.objects.exists()
+
+    def test_11_sqlite_bulk_mode_setup_failure(self, monkeypatch):
+        indexes = self.get_indexes()
+        drop = sqlite_bulk.drop_secondary_indexes
+
+        def fail(cursor, tables, statements):
+            drop(cursor, tables, statements)
+            raise RuntimeError('Сбой удаления индексов')
+
+        monkeypatch.setattr(sqlite_bulk, 'drop_secondary_indexes', fail)
+        with pytest.raises(RuntimeError):
+            self.load('--sqlite-bulk')
+        assert self.get_indexes() == indexes, (
+            'Проверьте, что индексы пересоздаются и при сбое во время '
+            'их удаления.'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            assert cursor.fetchone()[0] != 0, (
+                'Проверьте, что PRAGMA восстанавливаются и при сбое во '
+                'время подготовки загрузки.'
+            )
+
+    def test_12_validate_only_out_of_range(self, tmp_path):
+        data_dir = settings.BASE_DIR / 'static' / 'data'
+        for path in data_dir.glob('*.csv'):
+            shutil.copy(path, tmp_path / path.name)
+        with open(tmp_path / 'titles.csv', 'a', encoding='utf-8') as file:
+            file.write('\n900,Огромный,99999999999999999999999,1')
+        out = StringIO()
+        with pytest.raises(CommandError, match='Найдено нарушений: 1'):
+            call_command(
+                'load_csv', '--data-dir', str(tmp_path), '--validate-only',
+                stdout=out,
+            )
+        assert 'Title, строка 33: year' in out.getvalue(), (
+            'Проверьте, что `--validate-only` сообщает о числах вне '
+            'диапазона как о нарушении, а не падает.'
+        )
+
+    def test_13_validate_only_against_database(self, tmp_path):
+        data_dir = settings.BASE_DIR / 'static' / 'data'
+        for path in data_dir.glob('*.csv'):
+            shutil.copy(path, tmp_path / path.name)
+        self.load('--data-dir', str(tmp_path))
+        output = self.load('--data-dir', str(tmp_path), '--validate-only')
+        assert 'Нарушений не найдено' in output, (
+            'Проверьте, что строки с тем же первичным ключом, что и в '
+            'базе, не считаются повторами.'
+        )
+
+        User.objects.create(username='db_only', email='db_only@yamdb.fake')
+        Genre.objects.create(name='Только в базе', slug='db_only')
+        with open(tmp_path / 'users.csv', 'a', encoding='utf-8') as file:
+            file.write('\n900,db_only,new@yamdb.fake,user,,,')
+        with open(tmp_path / 'genre.csv', 'a', encoding='utf-8') as file:
+            file.write('\n900,Копия,db_only')
+        out = StringIO()
+        with pytest.raises(CommandError, match='Найдено нарушений: 2'):
+            call_command(
+                'load_csv', '--data-dir', str(tmp_path), '--validate-only',
+                stdout=out,
+            )
+        output = out.getvalue()
+        for violation in (
+            'User, строка 6: username: уже есть в базе',
+            'Genre, строка 16: slug: уже есть в базе',
+        ):
+            assert violation in output, (
+                'Проверьте, что `--validate-only` проверяет уникальность '
+                'ключей и по строкам, уже загруженным в базу.'
+            )
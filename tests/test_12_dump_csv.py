@@ -0,0 +1,77 @@
+import csv
+import gzip
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12DumpCSV:
+    MODELS = (User, Category, Genre, Title, Review, Comment,
+              Title.genre.through)
+
+    def test_01_dump_matches_load_format(self, tmp_path):
+        call_command('load_csv', stdout=StringIO())
+        call_command(
+            'dump_csv', '--output-dir', str(tmp_path), '--chunk-size', '7',
+            stdout=StringIO()
+        )
+        data_dir = settings.BASE_DIR / 'static' / 'data'
+        for path in data_dir.glob('*.csv'):
+            with open(path, encoding='utf-8') as source:
+                expected_header = next(csv.reader(source))
+            with open(tmp_path / path.name, encoding='utf-8') as dumped:
+                header = next(csv.reader(dumped))
+                assert header[:len(expected_header)] == expected_header, (
+                    'Проверьте, что `dump_csv` выгружает колонки в том же '
+                    f'порядке, что и в {path.name}.'
+                )
+
+    def test_02_gzip_round_trip(self, tmp_path):
+        call_command('load_csv', stdout=StringIO())
+        counts = {model: model.objects.count() for model in self.MODELS}
+        call_command(
+            'dump_csv', '--output-dir', str(tmp_path), '--gzip',
+            stdout=StringIO()
+        )
+        with gzip.open(tmp_path / 'genre.csv.gz', 'rt',
+                       encoding='utf-8') as dumped:
+            assert sum(1 for _ in dumped) == counts[Genre] + 1
+        User.objects.all().delete()
+        Category.objects.all().delete()
+        Genre.objects.all().delete()
+        call_command(
+            'load_csv', '--data-dir', str(tmp_path), stdout=StringIO()
+        )
+        for model, count in counts.items():
+            assert model.objects.count() == count, (
+                'Проверьте, что файлы `dump_csv` загружаются командой '
+                f'`load_csv` без потерь для модели {model.__name__}.'
+            )
+
+    def test_03_title_description_round_trip(self, tmp_path):
+        call_command('load_csv', stdout=StringIO())
+        Title.objects.filter(pk=1).update(
+            description='Описание, с запятой и "кавычками"\nи переносом'
+        )
+        descriptions = dict(Title.objects.values_list('pk', 'description'))
+        call_command(
+            'dump_csv', 'titles.csv', '--output-dir', str(tmp_path),
+            stdout=StringIO()
+        )
+        Title.objects.all().delete()
+        call_command(
+            'load_csv', str(tmp_path / 'titles.csv'), '--skip-recompute',
+            stdout=StringIO()
+        )
+        assert dict(
+            Title.objects.values_list('pk', 'description')
+        ) == descriptions, (
+            'Проверьте, что `dump_csv` выгружает описание произведения '
+            'и оно сохраняется после повторной загрузки.'
+        )
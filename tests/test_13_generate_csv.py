@@ -0,0 +1,69 @@
+import csv
+from collections import Counter
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+from users.models import User
+
+
+class Test13GenerateCSV:
+    OPTIONS = (
+        '--users', '50', '--titles', '40', '--reviews', '600',
+        '--comments', '100', '--chunk-size', '64', '--seed', '7',
+    )
+
+    def generate(self, output_dir, *args):
+        call_command(
+            'generate_csv', '--output-dir', str(output_dir),
+            *self.OPTIONS, *args, stdout=StringIO()
+        )
+
+    def read(self, path):
+        with open(path, encoding='utf-8') as csv_file:
+            return list(csv.DictReader(csv_file))
+
+    def test_01_reproducible(self, tmp_path):
+        self.generate(tmp_path / 'first')
+        self.generate(tmp_path / 'second')
+        for path in (tmp_path / 'first').iterdir():
+            assert path.read_bytes() == (
+                tmp_path / 'second' / path.name
+            ).read_bytes(), (
+                'Проверьте, что `generate_csv` с одинаковым `--seed` '
+                f'генерирует одинаковый файл {path.name}.'
+            )
+
+    def test_02_reviews_shape(self, tmp_path):
+        self.generate(tmp_path)
+        reviews = self.read(tmp_path / 'review.csv')
+        pairs = {(row['author'], row['title_id']) for row in reviews}
+        assert len(pairs) == len(reviews), (
+            'Проверьте, что `generate_csv` не создаёт двух отзывов одного '
+            'автора на одно произведение.'
+        )
+        assert [int(row['id']) for row in reviews] == list(
+            range(1, len(reviews) + 1)
+        )
+        per_title = Counter(row['title_id'] for row in reviews)
+        assert max(per_title.values()) <= 50
+        assert max(per_title.values()) > 5 * min(per_title.values()), (
+            'Проверьте, что число отзывов на произведение распределено '
+            'неравномерно.'
+        )
+        assert {int(row['score']) for row in reviews} <= set(range(1, 11))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_loadable(self, tmp_path):
+        self.generate(tmp_path)
+        out = StringIO()
+        call_command('load_csv', '--data-dir', str(tmp_path), stdout=out)
+        assert 'Ошибка' not in out.getvalue()
+        assert 'Пропущено' not in out.getvalue()
+        assert User.objects.count() == 50
+        assert Title.objects.count() == 40
+        assert Review.objects.count() == len(
+            self.read(tmp_path / 'review.csv')
+        )
@@ -0,0 +1,111 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Avg, Count
+
+from reviews.models import Category, Review, Title, TitleStats
+from reviews.title_stats import count_scores
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleStats:
+
+    def check_stats(self):
+        titles = Title.objects.annotate(
+            avg=Avg('reviews__score'), count=Count('reviews')
+        ).filter(count__gt=0)
+        assert TitleStats.objects.count() == titles.count(), (
+            'Проверьте, что статистика есть у всех произведений с отзывами.'
+        )
+        for title in titles:
+            assert title.stats.reviews_count == title.count
+            assert title.stats.rating == pytest.approx(title.avg), (
+                'Проверьте, что рейтинг произведения равен средней оценке.'
+            )
+            assert sum(title.stats.score_histogram) == title.count
+
+    def test_01_recompute_after_load_csv(self):
+        out = StringIO()
+        call_command('load_csv', stdout=out)
+        assert 'Статистика' in out.getvalue(), (
+            'Проверьте, что `load_csv` пересчитывает статистику '
+            'после загрузки отзывов.'
+        )
+        self.check_stats()
+
+        TitleStats.objects.all().delete()
+        call_command('recompute_stats', '--fetch-size', '7', stdout=out)
+        self.check_stats()
+
+    def test_02_stats_follow_review_changes(self, user, admin):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        title = Title.objects.create(name='Фильм', year=2000,
+                                     category=category)
+        review = Review.objects.create(title=title, author=user, score=4,
+                                       text='Отзыв')
+        Review.objects.create(title=title, author=admin, score=10,
+                              text='Отзыв')
+        self.check_stats()
+        assert title.stats.score_histogram[3] == 1
+
+        review.delete()
+        self.check_stats()
+        title.delete()
+        assert not TitleStats.objects.exists(), (
+            'Проверьте, что статистика удаляется вместе с произведением.'
+        )
+
+    def create_titles(self, count):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        return [
+            Title.objects.create(name=f'Фильм {number}', year=2000,
+                                 category=category)
+            for number in range(count)
+        ]
+
+    def test_03_out_of_range_scores(self, user, admin, moderator):
+        first, second = self.create_titles(2)
+        Review.objects.bulk_create([
+            Review(title=first, author=user, score=11, text='Отзыв'),
+            Review(title=first, author=admin, score=0, text='Отзыв'),
+            Review(title=second, author=user, score=3, text='Отзыв'),
+        ])
+        out = StringIO()
+        call_command('recompute_stats', stdout=out)
+        assert 'Пропущено отзывов с оценкой вне 1..10: 2' in out.getvalue(), (
+            'Проверьте, что `recompute_stats` сообщает об оценках вне '
+            'диапазона.'
+        )
+        assert not TitleStats.objects.filter(title=first).exists()
+        assert second.stats.score_histogram == [0, 0, 1] + [0] * 7, (
+            'Проверьте, что оценка вне диапазона не попадает '
+            'в статистику другого произведения.'
+        )
+        Review.objects.create(title=first, author=moderator, score=5,
+                              text='Отзыв')
+        first.refresh_from_db()
+        assert first.stats.reviews_count == 1, (
+            'Проверьте, что пересчет одного произведения пропускает '
+            'оценки вне диапазона.'
+        )
+
+    def test_04_highest_title_id(self, user, monkeypatch):
+        titles = self.create_titles(3)
+        Review.objects.create(title=titles[-1], author=user, score=7,
+                              text='Отзыв')
+        histograms, skipped = count_scores()
+        assert skipped == 0
+        assert histograms[titles[-1].id][6] == 1, (
+            'Проверьте, что учитываются отзывы произведения '
+            'с наибольшим id.'
+        )
+        # Произведение добавлено после запроса Max(pk).
+        monkeypatch.setattr(
+            Title.objects, 'aggregate', lambda **kwargs: {'max_id': None}
+        )
+        histograms, _ = count_scores(fetch_size=1)
+        assert histograms[titles[-1].id][6] == 1, (
+            'Проверьте, что матрица оценок растет, если id произведения '
+            'больше запрошенного Max(pk).'
+        )
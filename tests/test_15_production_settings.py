@@ -0,0 +1,140 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+WARMUP_REQUESTS = 2000
+
+REQUESTS = 2000
+
+RSS_GROWTH_LIMIT = 2 * 1024 * 1024
+
+RSS_SCRIPT = '''
+import json
+import os
+import sys
+from wsgiref.util import setup_testing_defaults
+
+import django
+
+django.setup()
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.db import connection
+
+
+def get_rss():
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def get(application, path, token):
+    # С заголовком Authorization запрос идет мимо кеша ответов,
+    # и каждый раз выполняются представление, сериализатор и ORM.
+    environ = {
+        'PATH_INFO': path,
+        'HTTP_HOST': 'localhost',
+        'HTTP_AUTHORIZATION': f'Bearer {token}',
+    }
+    setup_testing_defaults(environ)
+    headers = {}
+    response = application(
+        environ,
+        lambda status, response_headers: headers.update(
+            status=status, **dict(response_headers)
+        ),
+    )
+    b''.join(response)
+    response.close()
+    return headers
+
+
+call_command('migrate', verbosity=0)
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import Category, Title
+from users.models import User
+
+category = Category.objects.create(name='Фильм', slug='movie')
+for number in range(10):
+    Title.objects.create(name=f'Фильм {number}', year=2000,
+                         category=category)
+token = AccessToken.for_user(
+    User.objects.create_user(username='reader', email='reader@yamdb.fake')
+)
+application = WSGIHandler()
+warmup, requests = map(int, sys.argv[1:])
+for _ in range(warmup):
+    get(application, '/api/v1/titles/', token)
+before = get_rss()
+cached = 0
+for _ in range(requests):
+    headers = get(application, '/api/v1/titles/', token)
+    assert headers['status'].startswith('200'), headers['status']
+    cached += 'X-Cache' in headers
+print(json.dumps({
+    'before': before,
+    'after': get_rss(),
+    'queries': len(connection.queries),
+    'cached': cached,
+}))
+'''
+
+
+class Test15ProductionSettings:
+
+    def test_01_production_profile(self, load_settings):
+        settings_production = load_settings('settings_production')
+        assert not settings_production.DEBUG
+        assert settings_production.REST_FRAMEWORK[
+            'DEFAULT_RENDERER_CLASSES'
+        ] == ['rest_framework.renderers.JSONRenderer'], (
+            'Проверьте, что в боевых настройках API отдаёт только JSON.'
+        )
+        assert settings_production.DATABASES['default']['CONN_MAX_AGE'] > 0
+        loaders = settings_production.TEMPLATES[0]['OPTIONS']['loaders']
+        assert loaders[0][0] == 'django.template.loaders.cached.Loader'
+        assert 'loaders' not in settings.TEMPLATES[0]['OPTIONS'], (
+            'Проверьте, что боевые настройки не изменяют базовые.'
+        )
+
+    def test_02_rss_stays_flat(self, tmp_path, production_env):
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'api_yamdb.settings_production',
+            'DJANGO_DB_NAME': str(tmp_path / 'db.sqlite3'),
+            'PYTHONPATH': str(Path(settings.BASE_DIR)),
+        }
+        result = subprocess.run(
+            [sys.executable, '-c', RSS_SCRIPT,
+             str(WARMUP_REQUESTS), str(REQUESTS)],
+            env=env, capture_output=True, text=True, check=True,
+        )
+        memory = json.loads(result.stdout)
+        assert memory['cached'] == 0, (
+            'Проверьте, что запросы теста памяти идут мимо кеша ответов.'
+        )
+        assert memory['queries'] == 0, (
+            'Проверьте, что с боевыми настройками Django не сохраняет '
+            'выполненные SQL-запросы.'
+        )
+        assert memory['after'] - memory['before'] < RSS_GROWTH_LIMIT, (
+            'Проверьте, что память процесса не растёт от запроса к запросу.'
+        )
+
+    def test_03_environment_is_required(self, load_settings, monkeypatch):
+        monkeypatch.delenv('DJANGO_SECRET_KEY')
+        with pytest.raises(ImproperlyConfigured):
+            load_settings('settings_production')
+        monkeypatch.setenv('DJANGO_SECRET_KEY', 'test-secret-key')
+        monkeypatch.delenv('DJANGO_ALLOWED_HOSTS')
+        assert load_settings('settings_production').ALLOWED_HOSTS == [], (
+            'Проверьте, что без `DJANGO_ALLOWED_HOSTS` боевые настройки '
+            'не принимают запросы с любым Host.'
+        )
@@ -0,0 +1,34 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16SQLitePragmas:
+    EXPECTED_PRAGMAS = {
+        'busy_timeout': 5000,
+        'synchronous': 1,
+        'cache_size': -65536,
+        'temp_store': 2,
+    }
+
+    def test_01_connection_pragmas(self):
+        with connection.cursor() as cursor:
+            for name, expected in self.EXPECTED_PRAGMAS.items():
+                cursor.execute(f'PRAGMA {name}')
+                assert cursor.fetchone()[0] == expected, (
+                    f'Проверьте, что новые соединения SQLite получают '
+                    f'PRAGMA {name} из SQLITE_PRAGMAS.'
+                )
+
+    def test_02_benchmark(self):
+        out = StringIO()
+        call_command(
+            'benchmark_sqlite', '--seconds', '0.2', '--readers', '2',
+            '--writers', '2', stdout=out,
+        )
+        lines = out.getvalue().splitlines()
+        assert len(lines) == 2
+        assert all('записей' in line for line in lines)
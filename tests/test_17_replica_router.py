@@ -0,0 +1,59 @@
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from rest_framework.test import APIClient
+
+from reviews.models import Category
+
+REPLICA = 'replica'
+
+
+@pytest.fixture
+def replica(tmp_path, settings):
+    connections.databases[REPLICA] = {
+        **connections.databases['default'],
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    call_command('migrate', database=REPLICA, verbosity=0)
+    settings.DATABASE_REPLICAS = [REPLICA]
+    cache.clear()
+    yield REPLICA
+    cache.clear()
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.databases[REPLICA]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ReplicaRouter:
+    URL = '/api/v1/categories/'
+
+    def get_slugs(self, client):
+        response = client.get(self.URL)
+        assert response.status_code == 200
+        return {category['slug'] for category in response.json()['results']}
+
+    def test_01_reads_go_to_replica(self, replica):
+        Category.objects.create(name='Фильм', slug='movie')
+        Category.objects.using(replica).create(name='Книга', slug='book')
+        assert self.get_slugs(APIClient()) == {'book'}, (
+            'Проверьте, что GET-запросы читают данные из реплики.'
+        )
+
+    def test_02_writer_is_pinned_to_primary(self, replica, admin_client):
+        response = admin_client.post(
+            self.URL, data={'name': 'Фильм', 'slug': 'movie'}
+        )
+        assert response.status_code == 201
+        assert self.get_slugs(admin_client) == {'movie'}, (
+            'Проверьте, что после записи клиент читает из основной базы '
+            'и видит свои изменения.'
+        )
+        assert self.get_slugs(APIClient()) == set(), (
+            'Проверьте, что закрепление за основной базой действует только '
+            'на клиента, который записывал данные.'
+        )
+        assert not Category.objects.using(replica).exists(), (
+            'Проверьте, что запись идёт в основную базу.'
+        )
@@ -0,0 +1,253 @@
+import threading
+import time
+
+import pytest
+from django.db import transaction
+from django.http import JsonResponse
+from django.test import RequestFactory
+from rest_framework.test import APIClient
+
+from api import response_cache
+from api.checks import check_shared_caches
+from api.middleware import AnonymousResponseCacheMiddleware
+from reviews.models import Category, Review, Title
+from users.models import User
+
+
+class SlowView:
+    """Медленное представление, которое считает свои вызовы."""
+
+    def __init__(self, seconds=0.2):
+        self.seconds = seconds
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        time.sleep(self.seconds)
+        return JsonResponse({'calls': self.calls})
+
+
+class FailingView(SlowView):
+    """Медленное представление, которое всегда отвечает ошибкой."""
+
+    def __init__(self, seconds=0.2):
+        super().__init__(seconds)
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        with self.lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.seconds)
+        with self.lock:
+            self.running -= 1
+        return JsonResponse({'detail': 'Ошибка'}, status=500)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ResponseCache:
+    URL = '/api/v1/categories/'
+
+    def test_01_anonymous_get_is_cached(self):
+        client = APIClient()
+        Category.objects.create(name='Фильм', slug='movie')
+        response = client.get(self.URL, {'search': 'Фильм', 'page': 1})
+        assert response['X-Cache'] == 'MISS'
+        response = client.get(self.URL, {'page': 1, 'search': 'Фильм'})
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный анонимный GET-запрос отдаётся '
+            'из кеша независимо от порядка параметров.'
+        )
+        assert response.json()['results'][0]['slug'] == 'movie'
+        response = client.get(self.URL, {'search': 'Книга'})
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что ответы с разными параметрами кешируются '
+            'отдельно.'
+        )
+
+    def test_02_bypass(self, admin_client):
+        admin_client.get(self.URL)
+        response = admin_client.get(self.URL)
+        assert 'X-Cache' not in response, (
+            'Проверьте, что запросы с заголовком Authorization идут '
+            'мимо кеша.'
+        )
+        response = APIClient().get('/api/v1/users/')
+        assert 'X-Cache' not in response, (
+            'Проверьте, что запросы к /users/ идут мимо кеша.'
+        )
+
+    def test_03_write_invalidates(self, admin_client):
+        client = APIClient()
+        client.get(self.URL)
+        response = admin_client.post(
+            self.URL, data={'name': 'Фильм', 'slug': 'movie'}
+        )
+        assert response.status_code == 201
+        response = client.get(self.URL)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что запись в ресурс сбрасывает кеш его ответов.'
+        )
+        assert response.json()['count'] == 1
+
+    def test_04_review_invalidates_title(self, user):
+        client = APIClient()
+        category = Category.objects.create(name='Фильм', slug='movie')
+        title = Title.objects.create(name='Фильм', year=2000,
+                                     category=category)
+        url = f'/api/v1/titles/{title.id}/'
+        assert client.get(url).json()['rating'] is None
+        Review.objects.create(title=title, author=user, score=7,
+                              text='Отзыв')
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 7, (
+            'Проверьте, что новый отзыв сбрасывает кеш произведения.'
+        )
+
+    def test_05_stale_while_revalidate(self, settings):
+        client = APIClient()
+        client.get(self.URL)
+        settings.RESPONSE_CACHE_SECONDS = 0
+        key = response_cache.find_entry_key(client.get(self.URL).wsgi_request)
+        assert response_cache.acquire_lease(key)
+        Category.objects.create(name='Фильм', slug='movie')
+        response = client.get(self.URL)
+        assert response['X-Cache'] == 'STALE', (
+            'Проверьте, что пока ответ обновляет другой запрос, '
+            'клиенты получают устаревший ответ.'
+        )
+        assert response.json()['count'] == 0
+        response_cache.release_lease(key)
+        response = client.get(self.URL)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 1
+
+    def test_06_concurrent_misses_are_coalesced(self):
+        view = SlowView()
+        middleware = AnonymousResponseCacheMiddleware(view)
+        request = RequestFactory().get('/api/v1/titles/1/')
+        responses = []
+
+        def get():
+            responses.append(middleware(request))
+
+        threads = [threading.Thread(target=get) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert view.calls == 1, (
+            'Проверьте, что при промахе кеша ответ строит один запрос, '
+            'а остальные ждут его.'
+        )
+        assert sorted(response['X-Cache'] for response in responses) == (
+            ['HIT'] * 9 + ['MISS']
+        )
+        assert {response.content for response in responses} == {
+            b'{"calls": 1}'
+        }
+
+    def test_07_waits_for_other_process(self):
+        view = SlowView(seconds=0)
+        middleware = AnonymousResponseCacheMiddleware(view)
+        request = RequestFactory().get('/api/v1/titles/1/')
+        key = response_cache.get_flight_key(request)
+        assert response_cache.acquire_lease(key)
+
+        def other_process():
+            time.sleep(0.2)
+            response = JsonResponse({'calls': 0})
+            response_cache.store_response(
+                response_cache.learn_vary_headers(request, response),
+                response,
+                response_cache.get_versions(
+                    response_cache.get_resources(request.path)
+                ),
+            )
+            response_cache.release_lease(key)
+
+        thread = threading.Thread(target=other_process)
+        thread.start()
+        response = middleware(request)
+        thread.join()
+        assert view.calls == 0, (
+            'Проверьте, что запрос ждёт ответ, который строит процесс, '
+            'захвативший аренду.'
+        )
+        assert response['X-Cache'] == 'HIT'
+
+    def test_08_lease_wait_is_limited(self, settings):
+        settings.RESPONSE_CACHE_WAIT_SECONDS = 0.2
+        view = SlowView(seconds=0)
+        middleware = AnonymousResponseCacheMiddleware(view)
+        request = RequestFactory().get('/api/v1/titles/1/')
+        assert response_cache.acquire_lease(
+            response_cache.get_flight_key(request)
+        )
+        response = middleware(request)
+        assert view.calls == 1, (
+            'Проверьте, что запрос строит ответ сам, если держатель '
+            'аренды не успел за RESPONSE_CACHE_WAIT_SECONDS.'
+        )
+        assert response['X-Cache'] == 'MISS'
+        assert not response_cache.flight_locks, (
+            'Проверьте, что блокировки построения ответов не копятся.'
+        )
+
+    def test_09_users_do_not_invalidate_titles(self):
+        client = APIClient()
+        client.get('/api/v1/titles/')
+        User.objects.create_user(username='signup', email='s@yamdb.fake')
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'HIT', (
+            'Проверьте, что регистрация пользователя не сбрасывает кеш '
+            'произведений.'
+        )
+
+    def test_10_shared_cache_check(self, settings):
+        settings.DEBUG = False
+        assert {
+            warning.id for warning in check_shared_caches(None)
+        } == {'api.W001'}, (
+            'Проверьте, что кеш ответов в памяти процесса вызывает '
+            'предупреждение.'
+        )
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        }}
+        assert check_shared_caches(None) == []
+
+    def test_11_waiters_do_not_queue_behind_errors(self):
+        view = FailingView()
+        middleware = AnonymousResponseCacheMiddleware(view)
+        request = RequestFactory().get('/api/v1/titles/1/')
+        responses = []
+
+        def get():
+            responses.append(middleware(request))
+
+        threads = [threading.Thread(target=get) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert view.calls == 5
+        assert {response.status_code for response in responses} == {500}
+        assert view.max_running > 1, (
+            'Проверьте, что если ответ не сохранился в кеш, ждущие '
+            'запросы строят его параллельно, а не по очереди.'
+        )
+        assert not response_cache.flight_locks
+
+    def test_12_versions_bumped_after_commit(self):
+        before = response_cache.get_versions(('categories',))
+        with transaction.atomic():
+            Category.objects.create(name='Фильм', slug='movie')
+            assert response_cache.get_versions(('categories',)) == before, (
+                'Проверьте, что версии ресурсов увеличиваются только '
+                'после фиксации транзакции.'
+            )
+        assert response_cache.get_versions(('categories',)) != before
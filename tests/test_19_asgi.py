@@ -0,0 +1,154 @@
+import asyncio
+import json
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIClient
+
+from api.middleware import (
+    AnonymousResponseCacheMiddleware,
+    ReplicaPinningMiddleware,
+)
+from api_yamdb.asgi import application
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+def asgi_call(method, path, body=b'', headers=()):
+    """
+    Выполняет запрос через обработчик ASGI проекта.
+    Возвращает отправленные обработчиком сообщения.
+    """
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'root_path': '',
+        'query_string': query.encode(),
+        'headers': [
+            (b'host', b'localhost'),
+            (b'content-length', str(len(body)).encode()),
+            *headers,
+        ],
+        'client': ('127.0.0.1', 0),
+        'server': ('localhost', 80),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body}
+
+    async def send(message):
+        messages.append(message)
+
+    async_to_sync(application)(scope, receive, send)
+    return messages
+
+
+def asgi_request(method, path, body=b'', headers=()):
+    """Выполняет запрос через обработчик ASGI проекта."""
+    messages = asgi_call(method, path, body, headers)
+    body = b''.join(message.get('body', b'') for message in messages[1:])
+    return messages[0]['status'], json.loads(body) if body else None
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ASGI:
+
+    def create_data(self, user):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(name='Фильм', year=2000,
+                                     category=category)
+        title.genre.add(genre)
+        review = Review.objects.create(title=title, author=user, score=7,
+                                       text='Отзыв')
+        Comment.objects.create(review=review, author=user,
+                               text='Комментарий')
+        return title, review
+
+    def test_01_asgi_responses_match_wsgi(self, user):
+        title, review = self.create_data(user)
+        client = APIClient()
+        for path in (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title.id}/',
+            f'/api/v1/titles/{title.id}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+            '/api/v1/genres/',
+        ):
+            status, data = asgi_request('GET', path)
+            assert status == 200
+            assert data == client.get(path).json(), (
+                f'Проверьте, что под ASGI `{path}` возвращает те же '
+                'данные, что и под WSGI.'
+            )
+        status, _ = asgi_request('GET', '/api/v1/titles/999/')
+        assert status == 404
+
+    def test_02_asgi_accepts_writes(self, token_admin):
+        Category.objects.create(name='Фильм', slug='movie')
+        Genre.objects.create(name='Драма', slug='drama')
+        status, data = asgi_request(
+            'POST', '/api/v1/titles/',
+            body=json.dumps({
+                'name': 'Фильм', 'year': 2000,
+                'category': 'movie', 'genre': ['drama'],
+            }).encode(),
+            headers=(
+                (b'content-type', b'application/json'),
+                (b'authorization',
+                 f'Bearer {token_admin["access"]}'.encode()),
+            ),
+        )
+        assert status == 201, (
+            'Проверьте, что под ASGI API принимает запись.'
+        )
+        assert Title.objects.filter(pk=data['id']).exists()
+
+    def test_03_streamed_pages_under_asgi(self, user, settings):
+        settings.STREAMING_PAGE_SIZE = 10
+        self.create_data(user)
+        status, data = asgi_request('GET', '/api/v1/titles/?limit=10')
+        assert status == 200
+        assert data['count'] == 1, (
+            'Проверьте, что под ASGI большие страницы тоже отдаются.'
+        )
+
+    def test_04_middleware_is_async_capable(self):
+        async def get_response(request):
+            return None
+
+        for middleware in (
+            ReplicaPinningMiddleware, AnonymousResponseCacheMiddleware
+        ):
+            assert asyncio.iscoroutinefunction(middleware(get_response)), (
+                'Проверьте, что промежуточные слои API работают под ASGI '
+                'без переключения в поток.'
+            )
+
+    def test_05_middleware_chain_under_asgi(self, caplog):
+        caplog.set_level(logging.DEBUG, logger='django.request')
+        for expected in ('MISS', 'HIT'):
+            messages = asgi_call('GET', '/api/v1/genres/')
+            assert messages[0]['status'] == 200
+            headers = {
+                name.lower(): value for name, value in messages[0]['headers']
+            }
+            assert headers.get(b'x-cache') == expected.encode(), (
+                'Проверьте, что под ASGI запросы проходят через кеш '
+                'ответов.'
+            )
+        adapted = [
+            record.getMessage() for record in caplog.records
+            if 'adapted' in record.getMessage()
+            and 'api.middleware' in record.getMessage()
+        ]
+        assert not adapted, (
+            'Проверьте, что обработчик ASGI вызывает промежуточные слои '
+            f'API без переключения в поток: {adapted}'
+        )
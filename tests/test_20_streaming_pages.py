@@ -0,0 +1,99 @@
+import json
+
+import pytest
+from django.db import connection
+from rest_framework.test import APIClient
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20StreamingPages:
+    URL = '/api/v1/titles/'
+
+    def create_titles(self, count):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genres = [
+            Genre.objects.create(name=f'Жанр {number}', slug=f'genre{number}')
+            for number in range(3)
+        ]
+        for number in range(count):
+            title = Title.objects.create(name=f'Фильм {number}', year=2000,
+                                         category=category)
+            title.genre.set(genres[:number % 3 + 1])
+        return title
+
+    def get_streamed(self, client, url, params):
+        response = client.get(url, params)
+        assert response.status_code == 200
+        assert response.streaming, (
+            'Проверьте, что большие страницы отдаются потоком.'
+        )
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_01_streamed_page_matches_regular(self, admin_client,
+                                              settings):
+        settings.STREAMING_BATCH_SIZE = 7
+        self.create_titles(30)
+        settings.STREAMING_PAGE_SIZE = 20
+        streamed = self.get_streamed(
+            admin_client, self.URL, {'limit': 20, 'offset': 5}
+        )
+        settings.STREAMING_PAGE_SIZE = 100
+        response = admin_client.get(self.URL, {'limit': 20, 'offset': 5})
+        assert not response.streaming
+        assert streamed == response.json(), (
+            'Проверьте, что потоковая страница совпадает с обычной.'
+        )
+        assert streamed['count'] == 30
+        assert len(streamed['results']) == 20
+        assert streamed['next'] and streamed['previous']
+
+    def test_02_queries_do_not_depend_on_rows(self, admin_client,
+                                              settings):
+        settings.STREAMING_PAGE_SIZE = 10
+        settings.STREAMING_BATCH_SIZE = 50
+        self.create_titles(100)
+        with CaptureQueriesContext(connection) as queries:
+            page = self.get_streamed(admin_client, self.URL, {'limit': 100})
+        assert len(page['results']) == 100
+        assert len(queries) <= 10, (
+            'Проверьте, что связанные объекты подгружаются пачками, '
+            'а не отдельным запросом для каждой строки.'
+        )
+
+    def test_03_reviews_and_empty_pages(self, admin_client, user, settings):
+        settings.STREAMING_PAGE_SIZE = 10
+        title = self.create_titles(1)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        assert self.get_streamed(admin_client, url, {'limit': 10}) == {
+            'count': 0, 'next': None, 'previous': None, 'results': [],
+        }
+        Review.objects.create(title=title, author=user, score=5,
+                              text='Отзыв')
+        page = self.get_streamed(admin_client, url, {'limit': 10})
+        assert page['results'][0]['author'] == user.username
+        response = admin_client.get(
+            '/api/v1/titles/999/reviews/', {'limit': 10}
+        )
+        assert response.status_code == 404
+
+    def test_04_only_titles_and_reviews_stream(self, settings):
+        settings.STREAMING_PAGE_SIZE = 10
+        self.create_titles(1)
+        client = APIClient()
+        response = client.get('/api/v1/genres/', {'limit': 10})
+        assert not response.streaming, (
+            'Проверьте, что потоком отдаются только списки произведений '
+            'и отзывов.'
+        )
+        for _ in range(2):
+            response = client.get(self.URL, {'limit': 10})
+            assert response.streaming
+            assert 'X-Cache' not in response, (
+                'Проверьте, что страницы, которые отдаются потоком, идут '
+                'мимо кеша ответов.'
+            )
+        response = client.get(self.URL, {'limit': 5})
+        assert response['X-Cache'] == 'MISS'
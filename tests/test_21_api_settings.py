@@ -0,0 +1,86 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.conf import settings
+
+REQUESTS_SCRIPT = '''
+import json
+from wsgiref.util import setup_testing_defaults
+
+import django
+
+django.setup()
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+
+call_command('migrate', verbosity=0)
+application = WSGIHandler()
+statuses = {}
+for path in ('/api/v1/', '/api/v1/genres/', '/api/v1/titles', '/admin/',
+             '/redoc/'):
+    environ = {'PATH_INFO': path, 'HTTP_HOST': 'localhost'}
+    setup_testing_defaults(environ)
+    response = application(
+        environ,
+        lambda status, headers: statuses.update({path: int(status[:3])}),
+    )
+    b''.join(response)
+    response.close()
+print(json.dumps(statuses))
+'''
+
+
+class Test21ApiSettings:
+
+    def test_01_lean_stack(self, load_settings):
+        settings_api = load_settings('settings_api')
+        for app in (
+            'django.contrib.admin',
+            'django.contrib.sessions',
+            'django.contrib.messages',
+            'django.contrib.staticfiles',
+        ):
+            assert app not in settings_api.INSTALLED_APPS, (
+                f'Проверьте, что в настройках API нет приложения `{app}`.'
+            )
+        for middleware in settings_api.MIDDLEWARE:
+            assert not middleware.startswith((
+                'django.contrib.',
+                'django.middleware.csrf',
+                'django.middleware.clickjacking',
+                'django.middleware.locale',
+            )), (
+                f'Проверьте, что в настройках API нет `{middleware}`.'
+            )
+        assert 'api.middleware.AnonymousResponseCacheMiddleware' in (
+            settings_api.MIDDLEWARE
+        )
+        assert not settings_api.DEBUG
+        assert 'django.contrib.admin' in settings.INSTALLED_APPS, (
+            'Проверьте, что настройки API не изменяют базовые.'
+        )
+
+    def test_02_api_only_urls(self, tmp_path, production_env):
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'api_yamdb.settings_api',
+            'DJANGO_DB_NAME': str(tmp_path / 'db.sqlite3'),
+            'PYTHONPATH': str(Path(settings.BASE_DIR)),
+        }
+        result = subprocess.run(
+            [sys.executable, '-c', REQUESTS_SCRIPT],
+            env=env, capture_output=True, text=True, check=True,
+        )
+        assert json.loads(result.stdout) == {
+            '/api/v1/': 200,
+            '/api/v1/genres/': 200,
+            '/api/v1/titles': 301,
+            '/admin/': 404,
+            '/redoc/': 404,
+        }, (
+            'Проверьте, что процессы API обслуживают только `api.urls`.'
+        )
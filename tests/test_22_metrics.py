@@ -0,0 +1,185 @@
+import json
+import re
+import subprocess
+import sys
+
+import pytest
+from rest_framework.test import APIClient
+
+from api import metrics
+from reviews.models import Category, Genre, Title
+
+
+@pytest.fixture
+def clear_metrics():
+    for histogram in metrics.HISTOGRAMS:
+        histogram.samples.clear()
+    yield
+    for histogram in metrics.HISTOGRAMS:
+        histogram.samples.clear()
+
+
+def get_value(text, name, view, method='GET'):
+    match = re.search(
+        rf'^{name}{{view="{view}",method="{method}"}} (\S+)$', text, re.M
+    )
+    assert match, f'Проверьте, что метрика `{name}` есть для `{view}`.'
+    return float(match.group(1))
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('clear_metrics')
+class Test22Metrics:
+
+    def create_titles(self, count):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        for number in range(count):
+            title = Title.objects.create(name=f'Фильм {number}', year=2000,
+                                         category=category)
+            title.genre.add(genre)
+
+    def get_metrics(self):
+        response = APIClient().get('/api/metrics/')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain'), (
+            'Проверьте, что метрики отдаются в текстовом формате Prometheus.'
+        )
+        return response.content.decode()
+
+    def test_01_request_metrics(self, admin_client):
+        self.create_titles(3)
+        response = admin_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        admin_client.get('/api/v1/titles/')
+        text = self.get_metrics()
+        assert get_value(
+            text, 'api_request_duration_seconds_count', 'titles-list'
+        ) == 2
+        assert get_value(
+            text, 'api_request_db_queries_sum', 'titles-list'
+        ) >= 2 * 3, (
+            'Проверьте, что учитывается число запросов к базе.'
+        )
+        assert get_value(text, 'api_request_db_seconds_sum', 'titles-list')
+        assert get_value(
+            text, 'api_request_serializer_seconds_sum', 'titles-list'
+        ), 'Проверьте, что учитывается время сериализации.'
+        assert get_value(
+            text, 'api_response_size_bytes_sum', 'titles-list'
+        ) == 2 * len(response.content)
+        assert '# TYPE api_request_duration_seconds histogram' in text
+        assert re.search(
+            r'^api_request_duration_seconds_bucket\{view="titles-list",'
+            r'method="GET",le="\+Inf"\} 2$', text, re.M
+        )
+
+    def test_02_streaming_and_unresolved(self, admin_client, settings):
+        settings.STREAMING_PAGE_SIZE = 5
+        self.create_titles(5)
+        response = admin_client.get('/api/v1/titles/', {'limit': 5})
+        size = len(b''.join(response.streaming_content))
+        admin_client.get('/api/v1/missing/')
+        text = self.get_metrics()
+        assert get_value(
+            text, 'api_response_size_bytes_sum', 'titles-list'
+        ) == size, (
+            'Проверьте, что размер потокового ответа учитывается целиком.'
+        )
+        assert get_value(
+            text, 'api_request_db_queries_sum', 'titles-list'
+        ) >= 3
+        assert get_value(
+            text, 'api_request_duration_seconds_count', 'unresolved'
+        ) == 1
+
+    def test_03_allowed_ips(self, settings):
+        client = APIClient(REMOTE_ADDR='10.0.0.1')
+        assert client.get('/api/metrics/').status_code == 404, (
+            'Проверьте, что метрики доступны только с METRICS_ALLOWED_IPS.'
+        )
+        settings.METRICS_TOKEN = 'metrics-token'
+        response = client.get(
+            '/api/metrics/', HTTP_AUTHORIZATION='Bearer metrics-token'
+        )
+        assert response.status_code == 200, (
+            'Проверьте, что метрики доступны с токеном METRICS_TOKEN.'
+        )
+        response = client.get(
+            '/api/metrics/', HTTP_AUTHORIZATION='Bearer other'
+        )
+        assert response.status_code == 404
+
+    def test_04_multiprocess_dir(self, settings, tmp_path):
+        settings.METRICS_MULTIPROCESS_DIR = str(tmp_path)
+        (tmp_path / metrics.FILE_NAME.format(1)).write_text(json.dumps({
+            'api_request_duration_seconds': [
+                [['genres-list', 'GET'], [1] + [0] * 11, 0.001],
+            ],
+        }))
+        APIClient().get('/api/v1/genres/')
+        text = self.get_metrics()
+        assert get_value(
+            text, 'api_request_duration_seconds_count', 'genres-list'
+        ) == 2, (
+            'Проверьте, что метрики процессов складываются через '
+            'METRICS_MULTIPROCESS_DIR.'
+        )
+        assert get_value(
+            text, 'api_request_db_queries_count', 'genres-list'
+        ) == 1
+
+    def test_05_restarted_pid_keeps_counters(self, settings, tmp_path,
+                                             monkeypatch):
+        settings.METRICS_MULTIPROCESS_DIR = str(tmp_path)
+        APIClient().get('/api/v1/genres/')
+        metrics.flush(force=True)
+        # Новый процесс с тем же pid: своих наблюдений у него еще нет.
+        monkeypatch.setattr(metrics, 'file_pid', None)
+        for histogram in metrics.HISTOGRAMS:
+            histogram.samples.clear()
+        metrics.flush(force=True)
+        assert len(list(tmp_path.glob(metrics.FILE_NAME.format('*')))) == 2
+        assert get_value(
+            self.get_metrics(), 'api_request_duration_seconds_count',
+            'genres-list',
+        ) == 1, (
+            'Проверьте, что процесс с повторно выданным pid не '
+            'перезаписывает метрики завершившегося.'
+        )
+
+    def test_06_production_requires_explicit_access(self, load_settings):
+        production = load_settings('settings_production')
+        assert production.METRICS_ALLOWED_IPS == [], (
+            'Проверьте, что в боевых настройках метрики не открыты '
+            'для 127.0.0.1 по умолчанию.'
+        )
+        assert production.METRICS_TOKEN is None
+
+    def test_07_dead_process_files_are_folded(self, settings, tmp_path):
+        settings.METRICS_MULTIPROCESS_DIR = str(tmp_path)
+        process = subprocess.Popen([sys.executable, '-c', 'pass'])
+        process.wait()
+        dead = tmp_path / metrics.FILE_NAME.format(
+            f'{process.pid}-{"a" * 32}'
+        )
+        dead.write_text(json.dumps({
+            'api_request_duration_seconds': [
+                [['genres-list', 'GET'], [1] + [0] * 11, 0.001],
+            ],
+        }))
+        APIClient().get('/api/v1/genres/')
+        for _ in range(2):
+            assert get_value(
+                self.get_metrics(), 'api_request_duration_seconds_count',
+                'genres-list',
+            ) == 2, (
+                'Проверьте, что метрики завершившихся процессов '
+                'учитываются один раз.'
+            )
+        assert not dead.exists(), (
+            'Проверьте, что файлы завершившихся процессов складываются '
+            'в общий файл и удаляются.'
+        )
+        assert (tmp_path / metrics.ARCHIVE_NAME).exists()
+        assert len(list(tmp_path.glob(metrics.FILE_NAME.format('*')))) == 1
@@ -0,0 +1,83 @@
+import logging
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from api.middleware import QueryLogMiddleware
+from api.query_log import fingerprint
+from reviews.models import Category, Genre, Title
+
+LOGGER = 'api.query_log'
+
+
+def repeat_queries(request):
+    for pk in range(12):
+        Category.objects.filter(pk=pk).exists()
+    return HttpResponse()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23QueryLog:
+
+    def test_01_fingerprint(self):
+        assert fingerprint(
+            "SELECT * FROM t WHERE id = 15 AND name = 'It''s'  LIMIT 21"
+        ) == 'SELECT * FROM t WHERE id = ? AND name = ? LIMIT ?'
+        assert fingerprint(
+            'SELECT * FROM t WHERE id IN (%s, %s, %s)'
+        ) == fingerprint('SELECT * FROM t WHERE id IN (1, 2)'), (
+            'Проверьте, что списки IN любой длины дают один отпечаток.'
+        )
+
+    def test_02_repeated_queries(self, settings, caplog):
+        settings.QUERY_LOG_ENABLED = True
+        middleware = QueryLogMiddleware(repeat_queries)
+        with caplog.at_level(logging.WARNING, logger=LOGGER):
+            middleware(RequestFactory().get('/api/v1/titles/'))
+        assert len(caplog.records) == 1, (
+            'Проверьте, что повторы одного запроса записываются в журнал.'
+        )
+        message = caplog.records[0].getMessage()
+        assert 'выполнен 12 раз' in message
+        assert 'GET /api/v1/titles/' in message
+        assert 'reviews_category' in message
+        assert 'middleware.py' in message, (
+            'Проверьте, что в журнал попадает стек вызовов.'
+        )
+
+    def test_03_slow_queries(self, settings, caplog):
+        settings.QUERY_LOG_ENABLED = True
+        settings.QUERY_LOG_SLOW_SECONDS = 0
+        settings.QUERY_LOG_REPEAT_LIMIT = 100
+        middleware = QueryLogMiddleware(repeat_queries)
+        with caplog.at_level(logging.WARNING, logger=LOGGER):
+            middleware(RequestFactory().get('/api/v1/titles/'))
+        assert len(caplog.records) == 12
+        assert caplog.records[0].getMessage().startswith(
+            'Медленный запрос'
+        )
+
+    def test_04_title_list_has_no_repeats(self, settings, caplog,
+                                          admin_client):
+        settings.QUERY_LOG_ENABLED = True
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        for number in range(15):
+            title = Title.objects.create(name=f'Фильм {number}', year=2000,
+                                         category=category)
+            title.genre.add(genre)
+        with caplog.at_level(logging.WARNING, logger=LOGGER):
+            response = admin_client.get('/api/v1/titles/', {'limit': 15})
+        assert response.status_code == 200
+        assert not caplog.records, (
+            'Проверьте, что в списке произведений нет запросов N+1.'
+        )
+
+    def test_05_disabled(self, settings, caplog):
+        settings.QUERY_LOG_ENABLED = False
+        settings.QUERY_LOG_SLOW_SECONDS = 0
+        middleware = QueryLogMiddleware(repeat_queries)
+        with caplog.at_level(logging.WARNING, logger=LOGGER):
+            middleware(RequestFactory().get('/api/v1/titles/'))
+        assert not caplog.records